@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Catalog memory benchmark
+
+Builds a catalog --scale times the size of fontawesome_icon_categories.json
+(every category repeated under a suffixed name) and compares peak Python
+memory (tracemalloc) and time for:
+
+- validating it with json.load versus the streaming validator;
+- writing it with json.dump versus CatalogStreamWriter.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from fontawesome_catalog import count_icon_records
+from fontawesome_catalog_stream import iter_categories, validate_catalog, write_catalog
+
+CATALOG_FILE = Path(__file__).parent / "fontawesome_icon_categories.json"
+
+
+def scaled_categories(path: Path, scale: int) -> Iterator[Tuple[str, List[str]]]:
+    """Yield the catalog's categories `scale` times, with -2, -3, ... name suffixes."""
+    for copy in range(1, scale + 1):
+        for name, icons in iter_categories(path):
+            yield (name if copy == 1 else f"{name}-{copy}"), icons
+
+
+def load_and_validate(path: Path) -> Dict:
+    """The in-memory baseline: json.load the whole file, then count."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    categories = data["categories"]
+    return {
+        "total_categories": len(categories),
+        "total_icons": sum(len(icons) for icons in categories.values()),
+        "total_icon_records": count_icon_records(categories),
+    }
+
+
+def measure(label: str, action: Callable[[], object]) -> None:
+    """Run `action` under tracemalloc and print its peak allocation and duration."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {peak / 1024 / 1024:>10.1f} {elapsed * 1000:>10.0f}")
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "catalog.json"
+        # Metadata totals are the original's times the scale, so the file validates
+        with open(CATALOG_FILE, "r", encoding="utf-8") as f:
+            metadata = json.load(f)["metadata"]
+        metadata = {
+            "scrape_date": metadata.get("scrape_date"),
+            "total_categories": metadata["total_categories"] * args.scale,
+            "total_icons": metadata["total_icons"] * args.scale,
+        }
+        write_catalog(path, metadata, scaled_categories(CATALOG_FILE, args.scale))
+        print(f"Catalog: {args.scale}x, {path.stat().st_size / 1024 / 1024:.1f} MB on disk\n")
+
+        print(f"{'method':<28} {'peak MB':>10} {'ms':>10}")
+        measure("validate: json.load", lambda: load_and_validate(path))
+        summary = validate_catalog(path)
+        measure("validate: streaming", lambda: validate_catalog(path))
+        if not summary.valid:
+            print(f"  Validation errors: {summary.errors}")
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        out = Path(tmp) / "out.json"
+
+        def dump() -> None:
+            with open(out, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+        measure("write: json.dump", dump)
+        out.unlink()
+        measure("write: streaming", lambda: write_catalog(out, data["metadata"], data["categories"].items()))
+        print("\nPeaks cover allocations made during each step only (the written data is already loaded).")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare in-memory and streaming catalog I/O.")
+    parser.add_argument("--scale", type=int, default=10, help="how many copies of the catalog to use")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Extractor micro-benchmark
+
+Loads a saved copy of the FontAwesome search grid (fixtures/fontawesome_search_grid.html)
+into a headless browser and compares the per-element extractor
+(extract_icon_names + find_next_button) with the batched single-evaluate
+snapshot (extract_grid_snapshot) by browser round-trips and wall time.
+"""
+
+import argparse
+import asyncio
+import inspect
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from playwright.async_api import async_playwright, Page
+
+from scrape_fontawesome_categories import (
+    extract_grid_snapshot,
+    extract_icon_names,
+    find_next_button,
+    is_button_disabled,
+)
+
+FIXTURE_FILE = Path(__file__).parent / "fixtures" / "fontawesome_search_grid.html"
+DEFAULT_ITERATIONS = 20
+
+
+class RoundTripCounter:
+    """Counts awaited Playwright calls made through the objects it wraps."""
+
+    def __init__(self):
+        self.count = 0
+
+    def wrap(self, target: Any) -> Any:
+        """Wrap a Playwright object so every awaited method call is counted."""
+        return _CountingProxy(target, self)
+
+
+class _CountingProxy:
+    """Transparent proxy that counts coroutine calls and wraps what they return."""
+
+    def __init__(self, target: Any, counter: RoundTripCounter):
+        self._target = target
+        self._counter = counter
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if inspect.iscoroutinefunction(attr):
+            async def counted(*args, **kwargs):
+                self._counter.count += 1
+                return self._wrap_result(await attr(*args, **kwargs))
+            return counted
+        if callable(attr):
+            def passthrough(*args, **kwargs):
+                return self._wrap_result(attr(*args, **kwargs))
+            return passthrough
+        return attr
+
+    def _wrap_result(self, result: Any) -> Any:
+        if isinstance(result, list):
+            return [self._wrap_result(item) for item in result]
+        if type(result).__module__.startswith("playwright"):
+            return _CountingProxy(result, self._counter)
+        return result
+
+
+async def legacy_extract(page: Page) -> List[str]:
+    """Old path: walk every article, then look up the next-page control."""
+    icons = await extract_icon_names(page)
+    next_button = await find_next_button(page, 1)
+    if next_button:
+        await is_button_disabled(next_button)
+    return icons
+
+
+async def batched_extract(page: Page) -> List[str]:
+    """New path: one evaluation for icons and pagination state."""
+    snapshot = await extract_grid_snapshot(page, 1)
+    return snapshot.icons
+
+
+async def measure(
+    page: Page,
+    extractor: Callable[[Page], Awaitable[List[str]]],
+    iterations: int,
+) -> Dict[str, float]:
+    """Run an extractor repeatedly and return round-trips, icons and timing."""
+    counter = RoundTripCounter()
+    counted_page = counter.wrap(page)
+    icons: List[str] = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        icons = await extractor(counted_page)
+    elapsed = time.perf_counter() - start
+    return {
+        "icons": len(icons),
+        "round_trips": counter.count / iterations,
+        "ms_per_run": elapsed / iterations * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    html = Path(args.fixture).read_text(encoding="utf-8")
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html)
+
+        # Warm up both paths so the first measurement doesn't pay for JIT/setup
+        await legacy_extract(page)
+        await batched_extract(page)
+
+        results = {
+            "per-element": await measure(page, legacy_extract, args.iterations),
+            "batched": await measure(page, batched_extract, args.iterations),
+        }
+        await browser.close()
+
+    print(f"Fixture: {args.fixture} ({args.iterations} iterations)")
+    print(f"{'extractor':<12} {'icons':>6} {'round-trips':>12} {'ms/run':>9}")
+    for name, result in results.items():
+        print(
+            f"{name:<12} {result['icons']:>6} "
+            f"{result['round_trips']:>12.0f} {result['ms_per_run']:>9.2f}"
+        )
+    legacy, batched = results["per-element"], results["batched"]
+    if batched["ms_per_run"]:
+        print(f"\nSpeed-up: {legacy['ms_per_run'] / batched['ms_per_run']:.1f}x")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare grid extractors on a local fixture.")
+    parser.add_argument("--fixture", default=str(FIXTURE_FILE), help="saved search grid HTML")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
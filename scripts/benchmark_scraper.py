@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+End-to-end scraper benchmark
+
+Runs scrape_all_categories against the offline fixture site
+(fontawesome_fixture_server.py) for every combination of the requested
+workers/navigation/extractor settings, and reports total wall time,
+per-category latency, browser round-trips, the browser cache hit rate and
+whether the scraped catalog matches the fixture exactly.
+
+With --persistent-profile every scenario shares one browser profile, so later
+scenarios start with a warm HTTP cache. --har records the fixture's responses
+to a HAR file or replays them from it (--har-mode); HAR URLs include the port,
+so the fixture then listens on a fixed one.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import statistics
+import tempfile
+import time
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmark_extractors import RoundTripCounter
+from fontawesome_fixture_server import DEFAULT_PORT, add_site_arguments, build_site, start_fixture_server
+from scrape_fontawesome_categories import DEFAULT_ALLOWED_HOSTS, ScrapeOptions, scrape_all_categories
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+async def run_scenario(
+    base_url: str,
+    expected: Dict[str, List[str]],
+    workers: int,
+    navigation: str,
+    extractor: str,
+    verbose: bool,
+    profile_dir: Optional[Path] = None,
+    har_path: Optional[Path] = None,
+    har_mode: str = "replay",
+) -> Dict:
+    """Scrape the fixture once with the given settings and measure it."""
+    counter = RoundTripCounter()
+    with tempfile.TemporaryDirectory() as tmp:
+        options = ScrapeOptions(
+            workers=workers,
+            category_delay=0.0,
+            navigation=navigation,
+            extractor=extractor,
+            checkpoint_file=Path(tmp) / "checkpoint.jsonl",
+            allowed_hosts=DEFAULT_ALLOWED_HOSTS + ("127.0.0.1",),
+            base_url=base_url,
+            wrap_page=counter.wrap,
+            profile_dir=profile_dir,
+            har_path=har_path,
+            har_mode=har_mode,
+        )
+        quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        with quiet:
+            result = await scrape_all_categories(options)
+        elapsed = time.perf_counter() - start
+
+    latencies = [entry["total_ms"] for entry in result.category_stats.values()] or [0.0]
+    return {
+        "workers": workers,
+        "navigation": navigation,
+        "extractor": extractor,
+        "wall_s": round(elapsed, 2),
+        "category_mean_ms": round(statistics.mean(latencies), 1),
+        "category_p95_ms": round(percentile(latencies, 0.95), 1),
+        "round_trips": counter.count,
+        "cache_hit_rate": result.cache.get("hit_rate"),
+        "network_bytes": result.cache.get("network_bytes"),
+        "categories": len(result.categories),
+        "correct": result.categories == expected,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    site = build_site(args)
+    expected = site.expected_categories()
+    port = args.port if args.port is not None else (DEFAULT_PORT if args.har else 0)
+    server, base_url = start_fixture_server(site, port=port)
+    print(f"Fixture: {len(site.catalog)} categories, page size {site.page_size}, "
+          f"API latency {site.latency_ms:.0f} ms, page latency {site.page_latency_ms:.0f} ms")
+
+    results = []
+    profile = tempfile.TemporaryDirectory() if args.persistent_profile else None
+    try:
+        for workers, navigation, extractor in product(args.workers, args.navigation, args.extractor):
+            results.append(await run_scenario(
+                base_url, expected, workers, navigation, extractor, args.verbose,
+                profile_dir=Path(profile.name) if profile else None,
+                har_path=Path(args.har) if args.har else None,
+                har_mode=args.har_mode,
+            ))
+            row = results[-1]
+            print(
+                f"workers={row['workers']:<2} navigation={row['navigation']:<5} "
+                f"extractor={row['extractor']:<7} wall={row['wall_s']:>7.2f}s "
+                f"category mean={row['category_mean_ms']:>7.1f}ms p95={row['category_p95_ms']:>7.1f}ms "
+                f"round-trips={row['round_trips']:>5} cache={row['cache_hit_rate'] or 0:>4.0%} "
+                f"correct={row['correct']}"
+            )
+    finally:
+        server.shutdown()
+        if profile:
+            profile.cleanup()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against the offline fixture.")
+    add_site_arguments(parser)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--navigation", nargs="+", choices=("url", "click"), default=["url", "click"])
+    parser.add_argument(
+        "--extractor", nargs="+", choices=("network", "batch", "dom"), default=["network", "batch", "dom"]
+    )
+    parser.add_argument(
+        "--persistent-profile",
+        action="store_true",
+        help="share one browser profile (and HTTP cache) across all scenarios",
+    )
+    parser.add_argument("--har", help="HAR file to record the fixture's responses to or replay them from")
+    parser.add_argument("--har-mode", choices=("record", "replay"), default="replay")
+    parser.add_argument("--port", type=int, help=f"fixture port (default: any, or {DEFAULT_PORT} with --har)")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the scraper's own output")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Search index benchmark
+
+Compares the prebuilt search index (fontawesome_icon_search_index.json) with a
+linear scan over every class string and category in
+fontawesome_icon_categories.json, on a set of typeahead queries.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from fontawesome_catalog import build_compact_catalog
+from fontawesome_search_index import SEARCH_INDEX_FILE, IconSearchIndex, build_search_index, tokenize
+
+CATALOG_FILE = Path(__file__).parent / "fontawesome_icon_categories.json"
+
+# Typeahead sequences plus a few multi-word and substring queries
+DEFAULT_QUERIES = [
+    "a", "ar", "arr", "arro", "arrow",
+    "h", "ho", "hou", "hous", "house",
+    "circle check", "user pen", "left-right", "medical", "anim", "spin", "xyz",
+]
+
+
+def linear_search(categories: Dict[str, List[str]], query: str, limit: int = 20) -> List[str]:
+    """The baseline: scan every class string and category name for each query word."""
+    words = tokenize(query)
+    matches: Dict[str, None] = {}
+    for category_name, class_strings in categories.items():
+        for class_string in class_strings:
+            name = class_string.rsplit(" ", 1)[-1][len("fa-"):]
+            if all(word in name or word in category_name for word in words):
+                matches.setdefault(name)
+    return list(matches)[:limit]
+
+
+def time_queries(search: Callable[[str], object], queries: List[str], rounds: int) -> float:
+    """Mean milliseconds per query over `rounds` passes of `queries`."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            search(query)
+    return (time.perf_counter() - start) * 1000 / (rounds * len(queries))
+
+
+def main(args: argparse.Namespace) -> None:
+    with open(CATALOG_FILE, "r", encoding="utf-8") as f:
+        categories = json.load(f)["categories"]
+
+    start = time.perf_counter()
+    build_search_index(build_compact_catalog(categories, {}))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    index = IconSearchIndex.load(Path(args.index))
+    load_ms = (time.perf_counter() - start) * 1000
+
+    queries = args.queries or DEFAULT_QUERIES
+    index_ms = time_queries(lambda query: index.search(query, limit=args.limit), queries, args.rounds)
+    linear_ms = time_queries(lambda query: linear_search(categories, query, args.limit), queries, args.rounds)
+
+    print(f"Catalog: {sum(len(icons) for icons in categories.values())} class strings, "
+          f"{len(categories)} categories")
+    print(f"Index build: {build_ms:.1f} ms, load: {load_ms:.1f} ms")
+    print(f"{'method':<8} {'ms/query':>10}")
+    print(f"{'index':<8} {index_ms:>10.4f}")
+    print(f"{'linear':<8} {linear_ms:>10.4f}")
+    if index_ms:
+        print(f"\nSpeed-up: {linear_ms / index_ms:.0f}x")
+
+    if args.show:
+        for query in queries:
+            hits = index.search(query, limit=5)
+            print(f"  {query!r}: {', '.join(hit.name for hit in hits)}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the icon search index against a linear scan.")
+    parser.add_argument("queries", nargs="*", help="queries to time (default: a built-in set)")
+    parser.add_argument("--index", default=str(SEARCH_INDEX_FILE))
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--show", action="store_true", help="print the top results per query")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,351 @@
+"""
+Shared catalog helpers for the FontAwesome scraper and metadata generator.
+
+The scraper's canonical output maps each category to a list of full class
+strings ("fa-classic fa-solid fa-address-card"). Style variants of the same
+icon are folded into one record, [name, style mask], where bit i of the mask
+stands for styles[i] in the build's style table (STYLE_PREFIXES, then any
+other style in order of first appearance); filtering by style is then a bit
+test.
+
+The compact format written alongside the canonical output stores every base
+icon once, in an icon table of records, and refers to icons by their integer
+position:
+
+    {
+      "format": "fontawesome-compact",
+      "version": 2,
+      "metadata": {...},
+      "styles": ["fa-classic fa-solid", "fa-classic fa-regular", ...],
+      "icons": [["address-card", 3], ["audio-description", 1], ...],
+      "category_names": ["accessibility", ...],
+      "category_icons": [[0, 1, [7, 1], ...], ...],   # per category, icon ids
+      "icon_categories": [[0, 12], [0], ...]          # per icon, category ids
+    }
+
+A category entry is a plain icon id when the category has every style of that
+icon, or [id, mask] when it only has some of them. `icon_categories` is the
+precomputed inverted index, so "which categories is this icon in" is a single
+lookup instead of a scan over every category list.
+
+For lazy loading, each category can also be written as its own small shard,
+fontawesome_icon_shards/<category>.<content hash>.json, next to a manifest.json
+listing every category's count, hash and file name. Shard names change
+whenever their content does, so clients can cache them indefinitely.
+
+Every artifact goes through write_json_artifact: it is only rewritten when its
+content changes (ignoring volatile keys such as scrape_date), and then via a
+temp file and rename, so readers never see a half-written file and unchanged
+data keeps its old file and mtime.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+COMPACT_OUTPUT_FILE = Path(__file__).parent / "fontawesome_icon_catalog.compact.json"
+COMPACT_FORMAT = "fontawesome-compact"
+COMPACT_VERSION = 2
+SHARDS_DIR = Path(__file__).parent / "fontawesome_icon_shards"
+SHARD_MANIFEST_NAME = "manifest.json"
+SHARD_HASH_LENGTH = 12
+
+# Keys whose values change on every run without the data changing; they are
+# left out of the content hash that decides whether an artifact is rewritten
+VOLATILE_KEYS = frozenset({"scrape_date"})
+
+# Known styles have fixed mask bits so masks stay comparable between runs. A
+# build appends any other style it meets to its own copy (see build_style_table).
+STYLE_PREFIXES: Tuple[str, ...] = (
+    "fa-classic fa-solid",
+    "fa-classic fa-regular",
+    "fa-classic fa-light",
+    "fa-classic fa-thin",
+    "fa-brands",
+    "fa-duotone fa-solid",
+    "fa-sharp fa-solid",
+    "fa-sharp fa-regular",
+    "fa-sharp fa-light",
+    "fa-sharp fa-thin",
+    "fa-sharp-duotone fa-solid",
+)
+
+
+def _without_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _without_volatile(item)
+            for key, item in value.items()
+            if key not in VOLATILE_KEYS
+        }
+    if isinstance(value, list):
+        return [_without_volatile(item) for item in value]
+    return value
+
+
+def content_hash(data: Any) -> str:
+    """SHA-256 of `data` as canonical JSON, ignoring VOLATILE_KEYS at any depth."""
+    canonical = json.dumps(
+        _without_volatile(data), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def dump_json(data: Any, minify: bool = False) -> str:
+    """Serialize an artifact, pretty-printed by default or minified for production."""
+    if minify:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def write_atomic(path: Path, body: bytes) -> None:
+    """Write `body` to a temp file next to `path`, then rename it into place."""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def write_json_artifact(path: Path, data: Any, minify: bool = False) -> bool:
+    """
+    Write `data` to `path` unless the file already holds the same content in the
+    same layout (pretty or minified). Returns True if the file was written.
+    """
+    if path.exists():
+        try:
+            existing_body = path.read_text(encoding="utf-8")
+            existing = json.loads(existing_body)
+        except (OSError, ValueError):
+            existing = None
+        if existing is not None:
+            existing_minified = not existing_body.startswith("{\n")
+            if existing_minified == minify and content_hash(existing) == content_hash(data):
+                return False
+
+    write_atomic(path, dump_json(data, minify).encode("utf-8"))
+    return True
+
+
+def report_write(written: bool, label: str, path: Path) -> None:
+    """Print whether an artifact was saved or left untouched."""
+    if written:
+        print(f"✅ {label} saved to {path}")
+    else:
+        print(f"✅ {label} unchanged, kept {path}")
+
+
+def split_icon_class(class_string: str) -> Tuple[str, str]:
+    """Split "fa-classic fa-solid fa-house" into ("fa-classic fa-solid", "house")."""
+    prefix, _, name = class_string.strip().rpartition(" ")
+    return prefix, name[len("fa-"):] if name.startswith("fa-") else name
+
+
+def build_style_table(class_strings: Iterable[str], base: Sequence[str] = STYLE_PREFIXES) -> List[str]:
+    """
+    The style table for a build: `base` (by default the fixed STYLE_PREFIXES),
+    then every other style prefix in `class_strings` in order of first appearance.
+    """
+    styles = list(base)
+    known = set(styles)
+    for class_string in class_strings:
+        prefix, _ = split_icon_class(class_string)
+        if prefix not in known:
+            known.add(prefix)
+            styles.append(prefix)
+    return styles
+
+
+def style_bit(prefix: str, styles: Sequence[str] = STYLE_PREFIXES) -> int:
+    """Return the mask bit for a style prefix such as "fa-classic fa-solid"."""
+    return 1 << styles.index(prefix)
+
+
+def style_prefixes(mask: int, styles: Sequence[str] = STYLE_PREFIXES) -> List[str]:
+    """List the style prefixes set in `mask`, in bit order."""
+    return [prefix for bit, prefix in enumerate(styles) if mask & (1 << bit)]
+
+
+def fold_icons(class_strings: List[str], styles: Optional[Sequence[str]] = None) -> List[List]:
+    """
+    Fold style variants into one [name, style mask] record per base icon,
+    in order of first appearance. Duplicate class strings fold away too.
+    Masks refer to `styles`, which defaults to the table built from
+    `class_strings` alone.
+    """
+    if styles is None:
+        styles = build_style_table(class_strings)
+    records: Dict[str, List] = {}
+    for class_string in class_strings:
+        prefix, name = split_icon_class(class_string)
+        record = records.get(name)
+        if record is None:
+            record = records[name] = [name, 0]
+        record[1] |= style_bit(prefix, styles)
+    return list(records.values())
+
+
+def expand_icon_records(records: List[List], styles: Sequence[str] = STYLE_PREFIXES) -> List[str]:
+    """Turn [name, style mask] records back into full class strings."""
+    return [
+        f"{prefix} fa-{name}"
+        for name, mask in records
+        for prefix in style_prefixes(mask, styles)
+    ]
+
+
+def count_icon_records(categories: Dict[str, List[str]]) -> int:
+    """Number of per-category base-icon records once style variants are folded."""
+    return sum(len(fold_icons(class_strings)) for class_strings in categories.values())
+
+
+def build_compact_catalog(categories: Dict[str, List[str]], metadata: Dict) -> Dict:
+    """Build the compact, style-folded catalog from category -> class strings."""
+    icons: List[List] = []
+    icon_ids: Dict[str, int] = {}
+    category_names = list(categories)
+    styles = build_style_table(
+        class_string for class_strings in categories.values() for class_string in class_strings
+    )
+    folded = [fold_icons(categories[category_name], styles) for category_name in category_names]
+
+    # First pass: one record per base icon with the union of its styles
+    for records in folded:
+        for name, mask in records:
+            icon_id = icon_ids.get(name)
+            if icon_id is None:
+                icon_id = icon_ids[name] = len(icons)
+                icons.append([name, 0])
+            icons[icon_id][1] |= mask
+
+    # Second pass: per-category ids (with a mask only where a category has a
+    # subset of the icon's styles) and the inverted index
+    category_icons: List[List] = []
+    icon_categories: List[List[int]] = [[] for _ in icons]
+    for category_id, records in enumerate(folded):
+        entries: List = []
+        for name, mask in records:
+            icon_id = icon_ids[name]
+            entries.append(icon_id if mask == icons[icon_id][1] else [icon_id, mask])
+            icon_categories[icon_id].append(category_id)
+        category_icons.append(entries)
+
+    return {
+        "format": COMPACT_FORMAT,
+        "version": COMPACT_VERSION,
+        "metadata": {
+            **metadata,
+            "unique_icons": len(icons),
+            "total_icon_records": sum(len(records) for records in folded),
+        },
+        "styles": styles,
+        "icons": icons,
+        "category_names": category_names,
+        "category_icons": category_icons,
+        "icon_categories": icon_categories,
+    }
+
+
+def expand_compact_catalog(compact: Dict, style: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Turn a compact catalog back into category -> class strings.
+    With `style` (e.g. "fa-classic fa-regular"), only that style is kept.
+    """
+    styles = compact["styles"]
+    icons = compact["icons"]
+    wanted = ~0 if style is None else 1 << styles.index(style)
+    expanded: Dict[str, List[str]] = {}
+    for category_name, entries in zip(compact["category_names"], compact["category_icons"]):
+        class_strings: List[str] = []
+        for entry in entries:
+            icon_id, mask = (entry, icons[entry][1]) if isinstance(entry, int) else entry
+            name = icons[icon_id][0]
+            class_strings.extend(
+                f"{prefix} fa-{name}"
+                for bit, prefix in enumerate(styles)
+                if mask & wanted & (1 << bit)
+            )
+        expanded[category_name] = class_strings
+    return expanded
+
+
+def save_compact_catalog(
+    categories: Dict[str, List[str]],
+    metadata: Dict,
+    path: Path = COMPACT_OUTPUT_FILE,
+) -> Dict:
+    """Write the compact catalog (minified) and return it."""
+    compact = build_compact_catalog(categories, metadata)
+    report_write(write_json_artifact(path, compact, minify=True), "Compact catalog", path)
+    print(f"   Base icons: {len(compact['icons'])}, size: {path.stat().st_size / 1024:.1f} KB")
+    return compact
+
+
+def build_category_shard(category_name: str, class_strings: List[str], styles: Sequence[str]) -> Dict:
+    """
+    The content of one category shard: its icons folded into [name, mask]
+    records against the build's style table, so every shard has the same one.
+    """
+    return {
+        "category": category_name,
+        "styles": list(styles),
+        "icons": fold_icons(class_strings, styles),
+    }
+
+
+def save_category_shards(
+    categories: Iterable[Tuple[str, List[str]]],
+    metadata_output: Dict,
+    styles: Sequence[str],
+    directory: Path = SHARDS_DIR,
+    minify: bool = False,
+) -> Dict:
+    """
+    Write one content-hashed shard per category plus a manifest built from the
+    categories metadata output (names, counts), and return the manifest.
+    `categories` is consumed one (name, class strings) pair at a time, so it can
+    be a stream (see fontawesome_catalog_stream.iter_categories); `styles` is the
+    build's style table. Shards left over from earlier runs are removed. Shards
+    are always minified; `minify` applies to the manifest.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    written: Dict[str, Dict] = {}
+    for category_name, class_strings in categories:
+        shard = build_category_shard(category_name, class_strings, styles)
+        body = dump_json(shard, minify=True).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:SHARD_HASH_LENGTH]
+        file_name = f"{category_name}.{digest}.json"
+        shard_path = directory / file_name
+        if not shard_path.exists():
+            write_atomic(shard_path, body)
+        written[category_name] = {
+            "file": file_name,
+            "hash": digest,
+            "icons": len(shard["icons"]),
+            "bytes": len(body),
+        }
+    # The manifest lists shards in category_names order, whatever order they came in
+    shards = {
+        category_name: written[category_name]
+        for category_name in metadata_output["category_names"]
+        if category_name in written
+    }
+
+    manifest = {**metadata_output, "shards": shards}
+    manifest_written = write_json_artifact(directory / SHARD_MANIFEST_NAME, manifest, minify)
+
+    current = {entry["file"] for entry in shards.values()} | {SHARD_MANIFEST_NAME}
+    for stale in directory.glob("*.json"):
+        if stale.name not in current:
+            stale.unlink()
+
+    report_write(manifest_written, "Category shards", directory)
+    print(f"   Shards: {len(shards)}, largest: {max(e['bytes'] for e in shards.values()) / 1024:.1f} KB")
+    return manifest
@@ -0,0 +1,342 @@
+"""
+Streaming reader, writer and validator for the canonical catalog
+(fontawesome_icon_categories.json: {"metadata": {...}, "categories": {name: [class strings]}}).
+
+CatalogStreamReader parses the file incrementally with json.JSONDecoder.raw_decode
+over a sliding buffer and yields one category at a time, so memory stays
+bounded by the largest category rather than the whole catalog.
+CatalogStreamWriter writes the same layout (byte-for-byte what json.dumps would
+produce) one category at a time, through a temp file that only replaces the
+target when the content changed. CatalogValidator checks the data and the
+metadata totals in the same pass.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fontawesome_catalog import build_style_table, content_hash, dump_json, fold_icons, split_icon_class
+
+CHUNK_SIZE = 64 * 1024  # characters read per refill
+CATEGORIES_KEY = "categories"
+METADATA_KEY = "metadata"
+_WHITESPACE = " \t\n\r"
+
+
+class CatalogFormatError(ValueError):
+    """The file is not a well-formed catalog."""
+
+
+class CatalogStreamReader:
+    """
+    Incremental reader. Iterate `categories()` to get (name, class strings)
+    pairs in file order; `metadata` and any other top-level keys (`extra`) are
+    filled in as the parser passes them.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.metadata: Optional[Dict[str, Any]] = None
+        self.extra: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._file = None
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0  # file offset (in characters) of self._buffer[0]
+        self._eof = False
+
+    def __enter__(self) -> "CatalogStreamReader":
+        self._file = open(self.path, "r", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._file.close()
+
+    def _fill(self) -> bool:
+        """Drop the consumed prefix of the buffer and append the next chunk."""
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """The next non-whitespace character ("" at end of file), not consumed."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise CatalogFormatError(
+                f"expected {char!r} at offset {self._offset + self._pos}, found {found or 'end of file'!r}"
+            )
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """Decode the next complete JSON value, reading more input until it fits."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number or literal ending exactly at the buffer end may continue
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    # Some messages already end in "at" ("Unterminated string starting at")
+                    message = e.msg[:-len(" at")] if e.msg.endswith(" at") else e.msg
+                    raise CatalogFormatError(f"{message} at offset {self._offset + e.pos}") from None
+            self._fill()
+
+    def _next_member(self) -> bool:
+        """After an object member: True if another follows, False at the closing brace."""
+        if self._peek() == ",":
+            self._pos += 1
+            return True
+        self._expect("}")
+        return False
+
+    def categories(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (category name, value) pairs, one at a time, in file order."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == CATEGORIES_KEY:
+                self._expect("{")
+                if self._peek() == "}":
+                    self._pos += 1
+                else:
+                    while True:
+                        name = self._value()
+                        self._expect(":")
+                        yield name, self._value()
+                        if not self._next_member():
+                            break
+            elif key == METADATA_KEY:
+                self.metadata = self._value()
+            else:
+                self.extra[key] = self._value()
+            if not self._next_member():
+                break
+        if self._peek():
+            raise CatalogFormatError(f"unexpected data after the catalog at offset {self._offset + self._pos}")
+
+
+def iter_categories(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, List[str]]]:
+    """Yield (category name, class strings) from a catalog file, one category at a time."""
+    with CatalogStreamReader(path, chunk_size) as reader:
+        yield from reader.categories()
+
+
+@dataclass
+class CatalogSummary:
+    """What a validation pass found."""
+    metadata: Dict[str, Any]
+    category_counts: Dict[str, int]
+    total_icons: int
+    total_icon_records: int
+    # The catalog's style table: STYLE_PREFIXES, then other styles as first seen
+    styles: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+class CatalogValidator:
+    """
+    Checks categories as they stream past (names, class string shape, duplicate
+    categories, which json.load would silently merge) and, at the end, the
+    metadata totals against what was counted.
+    """
+
+    def __init__(self, max_errors: int = 50):
+        self.max_errors = max_errors
+        self.category_counts: Dict[str, int] = {}
+        self.total_icons = 0
+        self.total_icon_records = 0
+        self.styles = build_style_table([])
+        self.errors: List[str] = []
+
+    def _error(self, message: str) -> None:
+        if len(self.errors) < self.max_errors:
+            self.errors.append(message)
+
+    def add(self, name: Any, icons: Any) -> None:
+        if not isinstance(name, str) or not name:
+            self._error(f"invalid category name {name!r}")
+            return
+        if name in self.category_counts:
+            self._error(f"category '{name}' appears more than once")
+        if not isinstance(icons, list):
+            self._error(f"category '{name}' is not a list of class strings")
+            return
+        class_strings = []
+        for icon in icons:
+            if not isinstance(icon, str) or not all(split_icon_class(icon)):
+                self._error(f"category '{name}' has an invalid class string {icon!r}")
+            else:
+                class_strings.append(icon)
+        self.styles = build_style_table(class_strings, self.styles)
+        self.category_counts[name] = len(icons)
+        self.total_icons += len(icons)
+        self.total_icon_records += len(fold_icons(class_strings, self.styles))
+
+    def finish(self, metadata: Optional[Dict[str, Any]]) -> CatalogSummary:
+        if metadata is None:
+            self._error("catalog has no metadata")
+            metadata = {}
+        expected = {
+            "total_categories": len(self.category_counts),
+            "total_icons": self.total_icons,
+            "total_icon_records": self.total_icon_records,
+        }
+        for key, counted in expected.items():
+            # total_icon_records is optional in older catalogs
+            if key in metadata and metadata[key] != counted:
+                self._error(f"metadata {key} is {metadata[key]} but the catalog has {counted}")
+            elif key not in metadata and key != "total_icon_records":
+                self._error(f"metadata is missing {key}")
+        return CatalogSummary(
+            metadata=metadata,
+            category_counts=self.category_counts,
+            total_icons=self.total_icons,
+            total_icon_records=self.total_icon_records,
+            styles=self.styles,
+            errors=self.errors,
+        )
+
+
+def validate_catalog(path: Path, chunk_size: int = CHUNK_SIZE) -> CatalogSummary:
+    """Validate a catalog file in one streaming pass."""
+    validator = CatalogValidator()
+    with CatalogStreamReader(path, chunk_size) as reader:
+        try:
+            for name, icons in reader.categories():
+                validator.add(name, icons)
+        except CatalogFormatError as e:
+            validator.errors.append(str(e))
+        return validator.finish(reader.metadata)
+
+
+def _indent(text: str, spaces: int) -> str:
+    """Indent every line of `text` after the first (for nesting json.dumps output)."""
+    return text.replace("\n", "\n" + " " * spaces)
+
+
+class CatalogStreamWriter:
+    """
+    Writes {"metadata": ..., "categories": {...}} one category at a time into a
+    temp file next to `path`. On close the temp file replaces `path`, unless
+    `path` already holds the same content (ignoring volatile metadata) in the
+    same layout, in which case it is discarded and `written` stays False.
+    """
+
+    def __init__(self, path: Path, metadata: Dict[str, Any], minify: bool = False):
+        self.path = path
+        self.metadata = metadata
+        self.minify = minify
+        self.written = False
+        self._temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self._file = None
+        self._count = 0
+
+    def __enter__(self) -> "CatalogStreamWriter":
+        self._file = open(self._temp_path, "w", encoding="utf-8")
+        metadata = dump_json(self.metadata, self.minify)
+        if self.minify:
+            self._file.write(f'{{"{METADATA_KEY}":{metadata},"{CATEGORIES_KEY}":{{')
+        else:
+            self._file.write(f'{{\n  "{METADATA_KEY}": {_indent(metadata, 2)},\n  "{CATEGORIES_KEY}": {{')
+        return self
+
+    def write_category(self, name: str, icons: List[str]) -> None:
+        key = json.dumps(name, ensure_ascii=False)
+        separator = "," if self._count else ""
+        if self.minify:
+            self._file.write(f"{separator}{key}:{dump_json(icons, minify=True)}")
+        else:
+            self._file.write(f"{separator}\n    {key}: {_indent(dump_json(icons), 4)}")
+        self._count += 1
+
+    def write_categories(self, categories: Iterable[Tuple[str, List[str]]]) -> None:
+        for name, icons in categories:
+            self.write_category(name, icons)
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        try:
+            if exc_type is None:
+                if self.minify:
+                    self._file.write("}}")
+                else:
+                    self._file.write("\n  }\n}" if self._count else "}\n}")
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._file.close()
+            if exc_type is None and not catalogs_equal(self.path, self._temp_path):
+                os.replace(self._temp_path, self.path)
+                self.written = True
+        finally:
+            if self._temp_path.exists():
+                self._temp_path.unlink()
+
+
+def _is_minified(path: Path) -> bool:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read(2) != "{\n"
+
+
+def catalogs_equal(a: Path, b: Path) -> bool:
+    """
+    Compare two catalog files category by category, in one streaming pass,
+    ignoring volatile metadata. Files in different layouts (pretty or
+    minified) are never equal, so switching layout rewrites the file.
+    """
+    if not a.exists() or not b.exists() or _is_minified(a) != _is_minified(b):
+        return False
+    sentinel = object()
+    try:
+        with CatalogStreamReader(a) as reader_a, CatalogStreamReader(b) as reader_b:
+            pairs_a, pairs_b = reader_a.categories(), reader_b.categories()
+            while True:
+                pair_a, pair_b = next(pairs_a, sentinel), next(pairs_b, sentinel)
+                if pair_a != pair_b:
+                    return False
+                if pair_a is sentinel:
+                    break
+            return (
+                content_hash(reader_a.metadata) == content_hash(reader_b.metadata)
+                and content_hash(reader_a.extra) == content_hash(reader_b.extra)
+            )
+    except CatalogFormatError:
+        return False
+
+
+def write_catalog(
+    path: Path,
+    metadata: Dict[str, Any],
+    categories: Iterable[Tuple[str, List[str]]],
+    minify: bool = False,
+) -> bool:
+    """Stream a catalog to `path`. Returns True if the file was (re)written."""
+    with CatalogStreamWriter(path, metadata, minify) as writer:
+        writer.write_categories(categories)
+    return writer.written
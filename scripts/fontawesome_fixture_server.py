@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+FontAwesome Fixture Server
+
+A small offline stand-in for fontawesome.com's search page. It serves HTML with
+the selectors scrape_fontawesome_categories.py depends on
+(.icons-facets-group-categories, input[id^='icons-category-'], article.wrap-icon,
+.pagination-large-screen) and a JSON search API the page fetches to fill its
+grid. Category counts, page size and latency are configurable, so the scraper
+can be tested and benchmarked without network access.
+
+Like the real site, the page's script is a separate, immutable static asset
+(optionally padded with --bundle-kb to a realistic size), so browser cache
+reuse across runs shows up in the numbers. HTML and API responses are never
+cached.
+"""
+
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+CATALOG_FILE = Path(__file__).parent / "fontawesome_icon_categories.json"
+SEARCH_PATH = "/search"
+API_PATH = "/api/search"
+SCRIPT_PATH = "/static/app.js"
+DEFAULT_PORT = 8765
+DEFAULT_QUERY = "ip=classic&ic=free-collection"
+
+# An icon as the fixture stores it: base name plus its free styles, e.g. ("house", ["solid"])
+FixtureIcon = Tuple[str, List[str]]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>FontAwesome fixture</title>
+<style>
+  body {{ display: flex; font-family: sans-serif; }}
+  .icons-facets-group-categories {{ width: 16rem; }}
+  .icons-results {{ display: flex; flex-wrap: wrap; gap: 4px; }}
+  .pagination-large-screen {{ display: flex; gap: 4px; margin-top: 1rem; }}
+</style>
+</head>
+<body>
+<aside class="icons-facets-group-categories">
+  <ul>
+{categories}
+  </ul>
+</aside>
+<main>
+  <div class="icons-results" id="grid"></div>
+  <nav class="display-none tablet:display-flex flex-content-center flex-wrap flex-items-center pagination-large-screen" id="pagination"></nav>
+</main>
+<script src="{script_path}"></script>
+</body>
+</html>
+"""
+
+SCRIPT_TEMPLATE = """
+const state = {{ category: new URLSearchParams(location.search).get("c"), page: 1 }};
+if (state.category) {{
+  const input = document.getElementById("icons-category-" + state.category);
+  if (input) input.checked = true;
+}}
+
+async function load() {{
+  const params = new URLSearchParams({{ page: state.page }});
+  if (state.category) params.set("c", state.category);
+  const response = await fetch("{api_path}?" + params);
+  render(await response.json());
+}}
+
+function render(data) {{
+  document.getElementById("grid").innerHTML = data.hits.map((hit) =>
+    hit.membership.free.map((style) =>
+      `<article class="wrap-icon"><button class="icon flat" type="button">` +
+      `<i class="fa-classic fa-${{style}} fa-${{hit.id}}"></i><span>${{hit.id}}</span></button></article>`
+    ).join("")
+  ).join("");
+
+  const buttons = [`<button type="button" aria-label="Previous page" data-page="${{data.page - 1}}"` +
+    (data.page <= 1 ? " disabled class='disabled'" : "") + `>Prev</button>`];
+  for (let n = 1; n <= data.nbPages; n++) {{
+    buttons.push(`<button type="button" data-page="${{n}}"` +
+      (n === data.page ? " aria-current='page'" : "") + `>${{n}}</button>`);
+  }}
+  buttons.push(`<button type="button" aria-label="Next page" data-page="${{data.page + 1}}"` +
+    (data.page >= data.nbPages ? " disabled class='disabled'" : "") + `>Next</button>`);
+  document.getElementById("pagination").innerHTML = buttons.join("");
+}}
+
+document.getElementById("pagination").addEventListener("click", (event) => {{
+  const button = event.target.closest("button");
+  if (!button || button.disabled) return;
+  state.page = parseInt(button.dataset.page, 10);
+  load();
+}});
+
+document.querySelectorAll("input[id^='icons-category-']").forEach((input) => {{
+  input.addEventListener("change", () => {{
+    document.querySelectorAll("input[id^='icons-category-']").forEach((other) => {{
+      if (other !== input) other.checked = false;
+    }});
+    state.category = input.checked ? input.id.replace("icons-category-", "") : null;
+    state.page = 1;
+    load();
+  }});
+}});
+
+load();
+"""
+
+CATEGORY_TEMPLATE = (
+    '    <li><input type="checkbox" id="icons-category-{slug}">'
+    '<label for="icons-category-{slug}">{title} <span class="count">{count}</span></label></li>'
+)
+
+
+@dataclass
+class FixtureSite:
+    """The catalog the fixture serves and how it serves it."""
+    # Category slug -> icons, in the order the grid shows them
+    catalog: Dict[str, List[FixtureIcon]]
+    page_size: int = 72
+    latency_ms: float = 0.0  # added to every search API response
+    page_latency_ms: float = 0.0  # added to every HTML page load
+    bundle_kb: int = 0  # padding added to the page script, to model a real bundle
+    api_requests: int = field(default=0, init=False)
+    page_requests: int = field(default=0, init=False)
+    script_requests: int = field(default=0, init=False)
+
+    def expected_categories(self) -> Dict[str, List[str]]:
+        """The class strings a correct scrape of this site should produce."""
+        return {
+            slug: [f"fa-classic fa-{style} fa-{name}" for name, styles in icons for style in styles]
+            for slug, icons in self.catalog.items()
+        }
+
+    def search(self, category: Optional[str], page: int) -> Dict:
+        """Answer one search API request in the shape the scraper's harvester parses."""
+        if category:
+            icons = self.catalog.get(category, [])
+        else:
+            seen = {}
+            for category_icons in self.catalog.values():
+                for name, styles in category_icons:
+                    seen.setdefault(name, styles)
+            icons = list(seen.items())
+        pages = max(1, -(-len(icons) // self.page_size))
+        page = min(max(page, 1), pages)
+        start = (page - 1) * self.page_size
+        return {
+            "hits": [
+                {
+                    "id": name,
+                    "membership": {"free": styles},
+                    "categories": [category] if category else [],
+                }
+                for name, styles in icons[start:start + self.page_size]
+            ],
+            "page": page,
+            "nbPages": pages,
+            "nbHits": len(icons),
+        }
+
+    def render_page(self) -> str:
+        categories = "\n".join(
+            CATEGORY_TEMPLATE.format(
+                slug=html.escape(slug),
+                title=html.escape(slug.replace("-", " ").title()),
+                count=len(icons),
+            )
+            for slug, icons in self.catalog.items()
+        )
+        return PAGE_TEMPLATE.format(categories=categories, script_path=SCRIPT_PATH)
+
+    def render_script(self) -> str:
+        padding = f"\n/* {'x' * (self.bundle_kb * 1024)} */\n" if self.bundle_kb else ""
+        return SCRIPT_TEMPLATE.format(api_path=API_PATH) + padding
+
+
+def generate_catalog(
+    categories: int,
+    icons_per_category: int,
+    regular_share: float = 0.12,
+    seed: int = 0,
+) -> Dict[str, List[FixtureIcon]]:
+    """
+    Build a synthetic catalog. Icons are drawn from a shared pool so that, as on
+    the real site, many icons belong to several categories; about
+    `regular_share` of them also have a regular style.
+    """
+    rng = random.Random(seed)
+    pool_size = max(icons_per_category, categories * icons_per_category // 2)
+    pool = [
+        (f"icon-{n:05d}", ["solid", "regular"] if rng.random() < regular_share else ["solid"])
+        for n in range(pool_size)
+    ]
+    return {
+        f"category-{c:03d}": rng.sample(pool, icons_per_category)
+        for c in range(categories)
+    }
+
+
+def load_catalog(path: Path = CATALOG_FILE) -> Dict[str, List[FixtureIcon]]:
+    """Build a catalog from a real scrape, regrouping class strings by icon name."""
+    with open(path, "r", encoding="utf-8") as f:
+        categories = json.load(f)["categories"]
+    catalog: Dict[str, List[FixtureIcon]] = {}
+    for slug, class_strings in categories.items():
+        icons: Dict[str, List[str]] = {}
+        for class_string in class_strings:
+            _, style, name = class_string.split()
+            icons.setdefault(name[len("fa-"):], []).append(style[len("fa-"):])
+        catalog[slug] = list(icons.items())
+    return catalog
+
+
+def make_handler(site: FixtureSite) -> type:
+    """Create a request handler class bound to `site`."""
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            parts = urlsplit(self.path)
+            query = parse_qs(parts.query)
+            if parts.path == API_PATH:
+                site.api_requests += 1
+                time.sleep(site.latency_ms / 1000)
+                body = json.dumps(site.search(
+                    query.get("c", [None])[0],
+                    int(query.get("page", ["1"])[0]),
+                )).encode("utf-8")
+                self._send(body, "application/json")
+            elif parts.path in (SEARCH_PATH, "/"):
+                site.page_requests += 1
+                time.sleep(site.page_latency_ms / 1000)
+                self._send(site.render_page().encode("utf-8"), "text/html; charset=utf-8")
+            elif parts.path == SCRIPT_PATH:
+                site.script_requests += 1
+                self._send(
+                    site.render_script().encode("utf-8"),
+                    "text/javascript; charset=utf-8",
+                    cache_control="public, max-age=31536000, immutable",
+                )
+            else:
+                self.send_error(404)
+
+        def _send(self, body: bytes, content_type: str, cache_control: str = "no-store") -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass  # Keep benchmark output readable
+
+    return FixtureHandler
+
+
+def start_fixture_server(site: FixtureSite, host: str = "127.0.0.1", port: int = 0) -> tuple:
+    """
+    Serve `site` from a background thread.
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}{SEARCH_PATH}?{DEFAULT_QUERY}"
+    return server, base_url
+
+
+def build_site(args: argparse.Namespace) -> FixtureSite:
+    """Create a FixtureSite from command-line options."""
+    if args.from_catalog:
+        catalog = load_catalog(Path(args.from_catalog))
+    else:
+        catalog = generate_catalog(args.categories, args.icons_per_category, seed=args.seed)
+    return FixtureSite(
+        catalog=catalog,
+        page_size=args.page_size,
+        latency_ms=args.latency_ms,
+        page_latency_ms=args.page_latency_ms,
+        bundle_kb=args.bundle_kb,
+    )
+
+
+def add_site_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by the server and the benchmark for shaping the fixture."""
+    parser.add_argument("--categories", type=int, default=20, help="generated category count")
+    parser.add_argument("--icons-per-category", type=int, default=120)
+    parser.add_argument("--page-size", type=int, default=72, help="icons per grid page")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="search API latency")
+    parser.add_argument("--page-latency-ms", type=float, default=100.0, help="HTML page latency")
+    parser.add_argument("--bundle-kb", type=int, default=0, help="pad the cacheable page script to this size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--from-catalog",
+        nargs="?",
+        const=str(CATALOG_FILE),
+        help="serve a recorded catalog (default: fontawesome_icon_categories.json) instead",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve an offline FontAwesome search fixture.")
+    add_site_arguments(parser)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    site = build_site(args)
+    server, base_url = start_fixture_server(site, port=args.port)
+    print(f"Serving {len(site.catalog)} categories at {base_url}")
+    print("Scrape it with:")
+    print(f"  python scripts/scrape_fontawesome_categories.py --base-url '{base_url}' --allow-host 127.0.0.1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Prebuilt search index for FontAwesome icon lookup.
+
+Built from the compact catalog (see fontawesome_catalog.py), the index holds:
+
+- `name_terms`: every icon's full base name and each hyphen-separated token,
+  sorted, so a prefix lookup is a binary search followed by a short scan;
+- `category_terms`: the same for category names and their tokens;
+- `trigrams`: trigram -> icon ids over base names, for substring matches
+  ("arrow" inside "down-left-and-up-right-to-center" style queries).
+
+The index only holds what the compact catalog doesn't: icon names, styles and
+categories are read from the catalog, which the index names by content hash
+(`catalog_hash`). Name and trigram postings are icon ids into the catalog's
+`icons`, category postings are category ids; every posting list is sorted and
+delta-encoded (first id, then gaps). IconSearchIndex ranks matches (exact name,
+name prefix, token, category, substring) and answers typeahead queries over the
+full catalog in well under a millisecond.
+"""
+
+import json
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fontawesome_catalog import COMPACT_OUTPUT_FILE, content_hash, report_write, write_json_artifact
+
+SEARCH_INDEX_FILE = Path(__file__).parent / "fontawesome_icon_search_index.json"
+SEARCH_INDEX_FORMAT = "fontawesome-search-index"
+SEARCH_INDEX_VERSION = 2
+CATALOG_HASH_LENGTH = 12
+
+# Score for one query word matching an icon, by how it matched
+EXACT_TOKEN_SCORE = 70
+TOKEN_PREFIX_SCORE = 60
+EXACT_CATEGORY_SCORE = 40
+CATEGORY_PREFIX_SCORE = 30
+SUBSTRING_SCORE = 20
+# Bonus when the whole query matches the icon's name
+EXACT_NAME_BONUS = 100
+NAME_PREFIX_BONUS = 30
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a name or query into lowercase hyphen/space-separated tokens."""
+    return [token for token in re.split(r"[\s\-_]+", text.lower()) if token]
+
+
+def trigrams(text: str) -> Set[str]:
+    """The set of three-character substrings of `text`."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def delta_encode(ids: Iterable[int]) -> List[int]:
+    """Sorted ids as the first id followed by the gaps between neighbours."""
+    ordered = sorted(ids)
+    return [current - previous for previous, current in zip([0] + ordered, ordered)]
+
+
+def delta_decode(gaps: List[int]) -> List[int]:
+    """Inverse of delta_encode."""
+    return list(accumulate(gaps))
+
+
+def catalog_hash(compact: Dict) -> str:
+    """Identifies the compact catalog an index was built from (scrape_date aside)."""
+    return content_hash(compact)[:CATALOG_HASH_LENGTH]
+
+
+def _term_table(terms: Dict[str, Set[int]]) -> Tuple[List[str], List[List[int]]]:
+    ordered = sorted(terms)
+    return ordered, [delta_encode(terms[term]) for term in ordered]
+
+
+def build_search_index(compact: Dict) -> Dict:
+    """Build the search index artifact from a compact catalog."""
+    name_terms: Dict[str, Set[int]] = {}
+    category_terms: Dict[str, Set[int]] = {}
+    trigram_postings: Dict[str, Set[int]] = {}
+    for icon_id, (name, _) in enumerate(compact["icons"]):
+        for term in {name, *tokenize(name)}:
+            name_terms.setdefault(term, set()).add(icon_id)
+        for trigram in trigrams(name):
+            trigram_postings.setdefault(trigram, set()).add(icon_id)
+    for category_id, category_name in enumerate(compact["category_names"]):
+        for term in {category_name, *tokenize(category_name)}:
+            category_terms.setdefault(term, set()).add(category_id)
+
+    name_table, name_postings = _term_table(name_terms)
+    category_table, category_postings = _term_table(category_terms)
+    return {
+        "format": SEARCH_INDEX_FORMAT,
+        "version": SEARCH_INDEX_VERSION,
+        "catalog_hash": catalog_hash(compact),
+        "name_terms": name_table,
+        "name_postings": name_postings,
+        "category_terms": category_table,
+        "category_postings": category_postings,
+        "trigrams": {trigram: delta_encode(ids) for trigram, ids in sorted(trigram_postings.items())},
+    }
+
+
+def save_search_index(compact: Dict, path: Path = SEARCH_INDEX_FILE) -> Dict:
+    """Build the search index, write it (minified) and return it."""
+    index = build_search_index(compact)
+    report_write(write_json_artifact(path, index, minify=True), "Search index", path)
+    print(f"   Terms: {len(index['name_terms'])} name, {len(index['category_terms'])} category, "
+          f"{len(index['trigrams'])} trigrams, size: {path.stat().st_size / 1024:.1f} KB")
+    return index
+
+
+@dataclass
+class SearchHit:
+    """One ranked search result."""
+    name: str
+    score: int
+    styles: List[str]
+    categories: List[str]
+
+
+class IconSearchIndex:
+    """Query API over a prebuilt search index artifact and the compact catalog it was built from."""
+
+    def __init__(self, index: Dict, compact: Dict):
+        if index.get("version") != SEARCH_INDEX_VERSION:
+            raise ValueError(f"unsupported search index version {index.get('version')}")
+        if index["catalog_hash"] != catalog_hash(compact):
+            raise ValueError("the search index was built from a different compact catalog; rebuild it")
+        self.icons: List[str] = [name for name, _ in compact["icons"]]
+        self.styles: List[str] = compact["styles"]
+        self.masks: List[int] = [mask for _, mask in compact["icons"]]
+        self.category_names: List[str] = compact["category_names"]
+        self.icon_categories: List[List[int]] = compact["icon_categories"]
+        # Category id -> icon ids, for expanding category matches
+        self._category_members: List[List[int]] = [
+            [entry if isinstance(entry, int) else entry[0] for entry in entries]
+            for entries in compact["category_icons"]
+        ]
+        self._name_terms: List[str] = index["name_terms"]
+        self._name_postings: List[List[int]] = [delta_decode(gaps) for gaps in index["name_postings"]]
+        self._category_terms: List[str] = index["category_terms"]
+        self._category_postings: List[List[int]] = [
+            delta_decode(gaps) for gaps in index["category_postings"]
+        ]
+        self._trigrams: Dict[str, List[int]] = {
+            trigram: delta_decode(gaps) for trigram, gaps in index["trigrams"].items()
+        }
+
+    @classmethod
+    def load(
+        cls,
+        path: Path = SEARCH_INDEX_FILE,
+        catalog_path: Path = COMPACT_OUTPUT_FILE,
+    ) -> "IconSearchIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        with open(catalog_path, "r", encoding="utf-8") as f:
+            compact = json.load(f)
+        return cls(index, compact)
+
+    @staticmethod
+    def _prefix_matches(
+        terms: List[str],
+        postings: List[List[int]],
+        prefix: str,
+    ) -> Iterable[Tuple[str, List[int]]]:
+        position = bisect_left(terms, prefix)
+        while position < len(terms) and terms[position].startswith(prefix):
+            yield terms[position], postings[position]
+            position += 1
+
+    def _substring_matches(self, word: str) -> Set[int]:
+        grams = trigrams(word)
+        if not grams:
+            return set()
+        postings = sorted((self._trigrams.get(gram, []) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return {icon_id for icon_id in candidates if word in self.icons[icon_id]}
+
+    def _score_word(self, word: str) -> Dict[int, int]:
+        """Best score per icon for a single query word."""
+        scores: Dict[int, int] = {}
+
+        def offer(icon_ids: Iterable[int], score: int) -> None:
+            for icon_id in icon_ids:
+                if scores.get(icon_id, 0) < score:
+                    scores[icon_id] = score
+
+        for term, icon_ids in self._prefix_matches(self._name_terms, self._name_postings, word):
+            offer(icon_ids, EXACT_TOKEN_SCORE if term == word else TOKEN_PREFIX_SCORE)
+        for term, category_ids in self._prefix_matches(
+            self._category_terms, self._category_postings, word
+        ):
+            score = EXACT_CATEGORY_SCORE if term == word else CATEGORY_PREFIX_SCORE
+            for category_id in category_ids:
+                offer(self._category_members[category_id], score)
+        if len(word) >= 3:
+            offer(self._substring_matches(word), SUBSTRING_SCORE)
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = 20, style: Optional[str] = None) -> List[SearchHit]:
+        """
+        Rank icons matching every word of `query`.
+        `style` (e.g. "fa-classic fa-regular") keeps only icons available in that style.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        totals: Optional[Dict[int, int]] = None
+        for word in words:
+            scores = self._score_word(word)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {
+                    icon_id: total + scores[icon_id]
+                    for icon_id, total in totals.items()
+                    if icon_id in scores
+                }
+            if not totals:
+                return []
+
+        joined = "-".join(words)
+        style_bit = None if style is None else 1 << self.styles.index(style)
+        ranked: List[Tuple[int, int, str, int]] = []
+        for icon_id, score in totals.items():
+            if style_bit is not None and not self.masks[icon_id] & style_bit:
+                continue
+            name = self.icons[icon_id]
+            if name == joined:
+                score += EXACT_NAME_BONUS
+            elif name.startswith(joined):
+                score += NAME_PREFIX_BONUS
+            ranked.append((-score, len(name), name, icon_id))
+        ranked.sort()
+
+        return [
+            SearchHit(
+                name=name,
+                score=-negative_score,
+                styles=[prefix for bit, prefix in enumerate(self.styles) if self.masks[icon_id] & (1 << bit)],
+                categories=[self.category_names[c] for c in self.icon_categories[icon_id]],
+            )
+            for negative_score, _, name, icon_id in ranked[:limit]
+        ]
+
+    def search_categories(self, query: str) -> List[str]:
+        """Category names with a word starting with `query`, best matches first."""
+        words = tokenize(query)
+        if not words:
+            return []
+        prefix = "-".join(words)
+        matches = [
+            name for name in self.category_names
+            if name.startswith(prefix) or any(token.startswith(prefix) for token in tokenize(name))
+        ]
+        return sorted(matches, key=lambda name: (not name.startswith(prefix), len(name), name))
@@ -1,42 +1,263 @@
 #!/usr/bin/env python3
 """
 Generate categories metadata file from existing fontawesome_icon_categories.json
+Also writes the compact catalog (see fontawesome_catalog.py) and the icon
+search index built from it (see fontawesome_search_index.py), and the
+per-category shards with their manifest.
+
+Each output is a registered derived output with a version. The parsed input is
+shared by every output that needs rebuilding; .fontawesome_build_cache.json
+records, per output, the input hash and versions it was last built from, so
+up-to-date outputs are skipped. When the input's size and mtime are unchanged
+the input isn't even read, which keeps a no-op run cheap enough for a dev loop.
+
+The input is read with the streaming reader (see fontawesome_catalog_stream.py)
+and validated while it is counted; an invalid input stops the build before
+anything is written. The metadata output only needs those counts, and the
+shards stream the categories one at a time. Only the compact catalog (and the
+search index built from it) needs every category in memory at once, so the
+full category lists are loaded only when that output is stale.
+
+The scraper saves its results through the same pipeline (build_outputs), so
+this registry is the one place that decides which artifacts exist.
+
+Outputs are only rewritten when their content changes (see write_json_artifact).
+Pass --minify to write the metadata and manifest without indentation, and
+--force to rebuild everything.
 """
 
+import argparse
+import hashlib
 import json
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fontawesome_catalog import (
+    COMPACT_OUTPUT_FILE,
+    SHARD_MANIFEST_NAME,
+    SHARDS_DIR,
+    report_write,
+    save_category_shards,
+    save_compact_catalog,
+    write_json_artifact,
+)
+from fontawesome_catalog_stream import CatalogSummary, iter_categories, validate_catalog
+from fontawesome_search_index import SEARCH_INDEX_FILE, save_search_index
 
 INPUT_FILE = Path(__file__).parent / "fontawesome_icon_categories.json"
 OUTPUT_FILE = Path(__file__).parent / "fontawesome_categories_metadata.json"
+BUILD_CACHE_FILE = Path(__file__).parent / ".fontawesome_build_cache.json"
+
+
+@dataclass
+class BuildContext:
+    """The parsed input, shared by every derived output built in one run."""
+    summary: CatalogSummary
+    metadata: Dict
+    minify: bool = False
+    # Live sidebar counts from a scrape; None keeps the ones already stored
+    signals: Optional[Dict[str, int]] = None
+    results: Dict[str, Any] = field(default_factory=dict)
+    _categories: Optional[Dict[str, List[str]]] = field(default=None, repr=False)
+
+    @property
+    def categories(self) -> Dict[str, List[str]]:
+        """Every category's class strings, streamed in on first use."""
+        if self._categories is None:
+            self._categories = dict(iter_categories(INPUT_FILE))
+        return self._categories
+
+    def require(self, name: str) -> Any:
+        """Build the named output once per run and return its result."""
+        if name not in self.results:
+            self.results[name] = DERIVED_OUTPUTS[name].build(self)
+        return self.results[name]
+
+
+@dataclass
+class DerivedOutput:
+    """An artifact derived from the input. Bump `version` when its builder changes."""
+    name: str
+    version: int
+    paths: Tuple[Path, ...]
+    build: Callable[[BuildContext], Any]
+    depends: Tuple[str, ...] = ()
+
+
+# Registered outputs, built in registration order
+DERIVED_OUTPUTS: Dict[str, DerivedOutput] = {}
+
+
+def derived_output(name: str, version: int, *paths: Path, depends: Tuple[str, ...] = ()):
+    """Register the decorated function as the builder of a derived output."""
+    def register(build: Callable[[BuildContext], Any]) -> Callable[[BuildContext], Any]:
+        DERIVED_OUTPUTS[name] = DerivedOutput(name, version, paths, build, depends)
+        return build
+    return register
+
+
+@derived_output("metadata", 1, OUTPUT_FILE)
+def metadata_output(context: BuildContext) -> Dict:
+    """Category names, per-category counts and the input's metadata."""
+    counts = context.summary.category_counts
+    metadata = context.metadata
 
-def main():
-    # Load the existing JSON file
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    # Extract metadata and categories
-    metadata = data.get("metadata", {})
-    categories = data.get("categories", {})
-    
     # Extract just the category names (sorted)
-    category_names = sorted(categories.keys())
-    
+    category_names = sorted(counts.keys())
+
     # Create output with metadata and category list
     output = {
         "metadata": metadata,
         "category_names": category_names,
-        "category_counts": {
-            category: len(icons) for category, icons in sorted(categories.items())
-        }
+        "category_counts": {category: counts[category] for category in category_names},
     }
-    
-    # Save to file
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
-    
-    print(f"✅ Categories metadata saved to {OUTPUT_FILE}")
+
+    # Live sidebar counts for the next incremental run: the scraper passes fresh
+    # ones, a standalone build keeps the ones stored by the last scrape
+    signals = context.signals
+    if signals is None and OUTPUT_FILE.exists():
+        with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
+            signals = json.load(f).get("category_signals")
+    if signals:
+        output["category_signals"] = {
+            category: signals[category] for category in category_names if category in signals
+        }
+
+    # Save to file (skipped when the content is unchanged)
+    report_write(write_json_artifact(OUTPUT_FILE, output, context.minify), "Categories metadata", OUTPUT_FILE)
     print(f"   Total categories: {len(category_names)}")
     print(f"   Total icons: {metadata.get('total_icons', 'N/A')}")
+    print(f"   Base-icon records: {metadata['total_icon_records']}")
+    return output
+
+
+@derived_output("compact", 1, COMPACT_OUTPUT_FILE)
+def compact_output(context: BuildContext) -> Dict:
+    """The compact catalog with its icon -> categories index."""
+    return save_compact_catalog(context.categories, context.metadata)
+
+
+@derived_output("search_index", 2, SEARCH_INDEX_FILE, depends=("compact",))
+def search_index_output(context: BuildContext) -> Dict:
+    """The prefix/trigram search index over the compact catalog."""
+    return save_search_index(context.require("compact"))
+
+
+@derived_output("shards", 1, SHARDS_DIR / SHARD_MANIFEST_NAME, depends=("metadata",))
+def shards_output(context: BuildContext) -> Dict:
+    """
+    One content-hashed shard per category for lazy loading, plus the manifest.
+    Categories are streamed from the input one at a time.
+    """
+    return save_category_shards(
+        iter_categories(INPUT_FILE), context.require("metadata"), context.summary.styles, minify=context.minify
+    )
+
+
+def output_key(name: str, input_hash: str, minify: bool) -> str:
+    """Cache key for an output: the input, its version and those of its dependencies."""
+    output = DERIVED_OUTPUTS[name]
+    parts = [name, str(output.version), input_hash, str(minify)]
+    parts.extend(output_key(dependency, input_hash, minify) for dependency in output.depends)
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_build_cache() -> Dict:
+    """The previous run's build cache, or an empty one."""
+    try:
+        with open(BUILD_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def depends_on(name: str, target: str) -> bool:
+    """Whether output `name` is `target` or is built (directly or not) from it."""
+    return name == target or any(depends_on(dependency, target) for dependency in DERIVED_OUTPUTS[name].depends)
+
+
+def build_outputs(
+    minify: bool = False,
+    force: bool = False,
+    signals: Optional[Dict[str, int]] = None,
+) -> bool:
+    """
+    Rebuild every stale derived output of INPUT_FILE. `signals` (from a scrape)
+    replace the stored sidebar counts, so the metadata and everything built
+    from it are rebuilt. Returns False, without writing anything, when the
+    input is not a valid catalog.
+    """
+    start = time.perf_counter()
+    cache = {} if force else load_build_cache()
+    stat = INPUT_FILE.stat()
+    input_stat = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    # Only read and hash the input when it may have changed since the last build
+    if cache.get("input_stat") == input_stat:
+        input_hash = cache["input_hash"]
+    else:
+        input_hash = file_sha256(INPUT_FILE)
+
+    built = cache.get("outputs", {})
+    stale = [
+        name for name, output in DERIVED_OUTPUTS.items()
+        if built.get(name) != output_key(name, input_hash, minify)
+        or not all(path.exists() for path in output.paths)
+        or (signals is not None and depends_on(name, "metadata"))
+    ]
+
+    if stale:
+        # One streaming pass validates the input and counts what the metadata needs
+        summary = validate_catalog(INPUT_FILE)
+        if not summary.valid:
+            # Nothing is written, and the build cache is left as it was
+            print(f"❌ {INPUT_FILE.name} is not a valid catalog; no outputs were written:")
+            for error in summary.errors:
+                print(f"   {error}")
+            return False
+        metadata = {
+            **summary.metadata,
+            # One record per base icon and category, with style variants folded
+            "total_icon_records": summary.total_icon_records,
+        }
+        context = BuildContext(summary, metadata, minify, signals)
+        for name in stale:
+            context.require(name)
+            built[name] = output_key(name, input_hash, minify)
+
+    write_json_artifact(BUILD_CACHE_FILE, {
+        "input_stat": input_stat,
+        "input_hash": input_hash,
+        "outputs": built,
+    })
+
+    fresh = [name for name in DERIVED_OUTPUTS if name not in stale]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"✅ Built {len(stale)} output(s), {len(fresh)} up to date in {elapsed_ms:.0f} ms")
+    if fresh:
+        print(f"   Up to date: {', '.join(fresh)}")
+    return True
+
+
+def main(minify: bool = False, force: bool = False):
+    if not build_outputs(minify, force):
+        raise SystemExit(1)
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate the categories metadata and derived artifacts.")
+    parser.add_argument("--minify", action="store_true", help="write JSON without indentation")
+    parser.add_argument("--force", action="store_true", help="rebuild every output, ignoring the build cache")
+    args = parser.parse_args()
+    main(args.minify, args.force)
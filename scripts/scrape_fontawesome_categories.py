@@ -7,38 +7,293 @@ grouped by category tags. Uses browser automation to click through categories
 and scrape icons from filtered grids.
 """
 
+import argparse
 import asyncio
 import json
 import re
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set
-from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from playwright.async_api import (
+    async_playwright,
+    Browser,
+    BrowserContext,
+    Playwright,
+    ElementHandle,
+    Page,
+    TimeoutError as PlaywrightTimeoutError,
+)
+
+from fontawesome_catalog import (
+    build_style_table,
+    count_icon_records,
+    expand_icon_records,
+    fold_icons,
+    report_write,
+    write_json_artifact,
+)
+from fontawesome_catalog_stream import write_catalog
+from generate_categories_metadata import build_outputs
+from scraper_checkpoint import CheckpointJournal
+from scraper_network import DEFAULT_ALLOWED_HOSTS, CacheMeter, IconResponseHarvester, ResourceBlocker, TrafficMeter
+from scraper_profiling import RunProfiler, count_retry, profile_phase, profiled_sleep
+from scraper_rate_control import AdaptiveRateController, report_timeout
+from scraper_sharding import assign_shards, merge_partial_results, parse_shard_spec, shard_file
 
 
 # Configuration
 BASE_URL = "https://fontawesome.com/search?ip=classic&ic=free-collection"
+CATEGORY_URL_PARAM = "c"  # query parameter the search page uses for the category facet
 OUTPUT_FILE = Path(__file__).parent / "fontawesome_icon_categories.json"
 CATEGORIES_METADATA_FILE = Path(__file__).parent / "fontawesome_categories_metadata.json"
+CHECKPOINT_FILE = OUTPUT_FILE.with_suffix(".checkpoint.jsonl")
+CHANGES_REPORT_FILE = Path(__file__).parent / "fontawesome_icon_changes.json"
+RUN_REPORT_FILE = Path(__file__).parent / "fontawesome_scrape_report.json"
+# Default user data directory for --persistent-profile; its HTTP cache lives in cache/
+BROWSER_PROFILE_DIR = Path(__file__).parent / ".browser-profile"
+# Starting politeness delays; the rate controller scales them with the site's health
 DELAY_BETWEEN_CATEGORIES = 1.0  # seconds
 DELAY_BETWEEN_PAGES = 0.5  # seconds
+MAX_PAGE_RETRIES = 3  # attempts to turn a page before giving up on the rest of a category
 PAGE_LOAD_TIMEOUT = 30000  # milliseconds
 ELEMENT_WAIT_TIMEOUT = 10000  # milliseconds
+MAX_WORKERS = 8  # upper bound on concurrent pages, to stay polite
 
 
-async def wait_for_grid_update(page: Page, timeout: int = ELEMENT_WAIT_TIMEOUT) -> None:
-    """Wait for the icon grid to update after a category filter is applied."""
-    try:
-        # Wait for the icon grid container to be visible and stable
-        await page.wait_for_selector(
-            "article.wrap-icon",
-            timeout=timeout,
-            state="visible"
+@dataclass
+class ScrapeOptions:
+    """Tunable settings for a scraping run."""
+    workers: int = 1
+    category_delay: float = DELAY_BETWEEN_CATEGORIES
+    page_delay: float = DELAY_BETWEEN_PAGES
+    navigation: str = "url"  # "url" loads each filtered view directly, "click" toggles the sidebar
+    # "batch" snapshots the grid in one evaluation, "network" reads the page's API
+    # responses and checks them against the grid, "dom" walks the grid element by element
+    extractor: str = "batch"
+    resume: bool = False  # reuse categories already recorded in the checkpoint journal
+    checkpoint_file: Path = CHECKPOINT_FILE
+    incremental: bool = False  # only re-scrape categories whose sidebar count changed
+    lean: bool = True  # block images, fonts, media and third-party hosts
+    allowed_hosts: tuple = DEFAULT_ALLOWED_HOSTS
+    base_url: str = BASE_URL  # e.g. a local fixture server instead of fontawesome.com
+    # Reuse a browser profile (and its HTTP cache) from this directory across runs
+    profile_dir: Optional[Path] = None
+    # Record every response to, or replay responses from, this HAR file
+    har_path: Optional[Path] = None
+    har_mode: str = "replay"  # "record" or "replay"
+    # (i, N): only scrape the categories in shard i of N (1-based), see assign_shards
+    shard: Optional[tuple] = None
+    # Optional hook applied to every page the run opens (benchmarks wrap pages
+    # in a round-trip counter)
+    wrap_page: Optional[Callable[[Page], Page]] = None
+
+
+@dataclass
+class ScrapeResult:
+    """What a scraping run produced."""
+    # Category name -> icon class strings, in sidebar order
+    categories: Dict[str, List[str]] = field(default_factory=dict)
+    # Every category the sidebar listed, in order (a shard scrapes a subset)
+    all_categories: List[str] = field(default_factory=list)
+    # Category name -> cheap live signal (the sidebar count) used by incremental runs
+    category_signals: Dict[str, int] = field(default_factory=dict)
+    # Categories that lost pages to a failed page turn (saved, but not journaled)
+    partial_categories: List[str] = field(default_factory=list)
+    # Categories whose scraped base-icon count differs from their sidebar count
+    count_mismatches: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # Categories that were actually scraped this run (the rest were reused)
+    scraped_categories: List[str] = field(default_factory=list)
+    # Changed categories that failed to scrape and kept the previous run's icons
+    stale_categories: List[str] = field(default_factory=list)
+    # Category name -> requests, bytes transferred, page-load and total time
+    category_stats: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    blocked_requests: int = 0
+    profile: RunProfiler = field(default_factory=RunProfiler)
+    # AdaptiveRateController.summary(): responses, throttles, timeouts, delay factor
+    rate_control: Dict[str, Any] = field(default_factory=dict)
+    # CacheMeter.summary(): responses served from the browser cache, by resource type
+    cache: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class PageSession:
+    """A worker page together with the per-page helpers attached to it."""
+    page: Page
+    options: ScrapeOptions
+    traffic: TrafficMeter
+    # Shared with every other session: category name -> traffic/load stats
+    stats: Dict[str, Dict[str, float]]
+    rate: AdaptiveRateController
+    harvester: Optional[IconResponseHarvester] = None
+
+    @classmethod
+    def attach(
+        cls,
+        page: Page,
+        options: ScrapeOptions,
+        stats: Dict[str, Dict[str, float]],
+        rate: AdaptiveRateController,
+    ) -> "PageSession":
+        """
+        Wrap a page, installing a response harvester when it is needed and
+        feeding its responses to the shared rate controller.
+        """
+        harvester = IconResponseHarvester(page) if options.extractor == "network" else None
+        rate.observe(page)
+        return cls(
+            page=page,
+            options=options,
+            traffic=TrafficMeter(page),
+            stats=stats,
+            rate=rate,
+            harvester=harvester,
         )
-        # Additional small delay to ensure all icons are loaded
-        await asyncio.sleep(0.5)
-    except PlaywrightTimeoutError:
-        print("  Warning: Timeout waiting for grid to update")
+
+
+# Grid readiness: the grid counts as updated once its content fingerprint
+# differs from the one taken before the action, the DOM has been quiet for
+# GRID_QUIET_MS and the page has no fetch/XHR requests in flight.
+GRID_QUIET_MS = 150
+GRID_READY_MIN_TIMEOUT = 2000  # milliseconds
+GRID_READY_MAX_TIMEOUT = 20000  # milliseconds
+
+# Counts in-flight fetch/XHR requests so readiness can wait for network idle
+# without a round-trip per request. Installed on the context before navigation.
+READINESS_INIT_SCRIPT = """
+(() => {
+    if (window.__gridInflight !== undefined) return;
+    window.__gridInflight = 0;
+    const done = () => { window.__gridInflight = Math.max(0, window.__gridInflight - 1); };
+    const originalFetch = window.fetch;
+    window.fetch = function (...args) {
+        window.__gridInflight++;
+        return originalFetch.apply(this, args).finally(done);
+    };
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        window.__gridInflight++;
+        this.addEventListener("loadend", done, { once: true });
+        return originalSend.apply(this, args);
+    };
+})();
+"""
+
+GRID_FINGERPRINT_FUNCTION = """
+const gridFingerprint = () => {
+    const icons = document.querySelectorAll("article.wrap-icon button.icon.flat i");
+    let hash = 0;
+    for (const i of icons) {
+        const cls = i.getAttribute("class") || "";
+        for (let k = 0; k < cls.length; k++) hash = (hash * 31 + cls.charCodeAt(k)) | 0;
+    }
+    return icons.length ? icons.length + ":" + hash : "";
+};
+"""
+
+GRID_READY_SCRIPT = """
+({ previous, quietMs, timeoutMs }) => new Promise((resolve) => {
+""" + GRID_FINGERPRINT_FUNCTION + """
+    const start = performance.now();
+    let lastMutation = start;
+    const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+    observer.observe(document.body, { childList: true, subtree: true });
+    const finish = (ready) => {
+        observer.disconnect();
+        clearInterval(timer);
+        resolve({ ready, fingerprint: gridFingerprint(), elapsed: performance.now() - start });
+    };
+    const timer = setInterval(() => {
+        const now = performance.now();
+        const fingerprint = gridFingerprint();
+        const changed = fingerprint !== "" && fingerprint !== previous;
+        const quiet = now - lastMutation >= quietMs && !(window.__gridInflight > 0);
+        if (changed && quiet) finish(true);
+        else if (now - start >= timeoutMs) finish(false);
+    }, 25);
+});
+"""
+
+GRID_FINGERPRINT_SCRIPT = "() => {" + GRID_FINGERPRINT_FUNCTION + " return gridFingerprint(); }"
+
+
+def icons_fingerprint(class_strings: List[str]) -> str:
+    """The fingerprint gridFingerprint() would give a grid showing `class_strings`."""
+    digest = 0
+    for class_string in class_strings:
+        for char in class_string:
+            digest = (digest * 31 + ord(char)) & 0xFFFFFFFF
+    if digest >= 1 << 31:
+        digest -= 1 << 32  # JavaScript's `| 0` wraps to a signed 32-bit int
+    return f"{len(class_strings)}:{digest}" if class_strings else ""
+
+
+class AdaptiveTimeout:
+    """
+    A timeout that follows how long grid updates actually take.
+    It tracks an exponential moving average of observed durations and allows
+    `factor` times that, clamped to [minimum, maximum] milliseconds.
+    """
+
+    def __init__(self, initial: float, minimum: float, maximum: float, factor: float = 4.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self._average = initial / factor
+
+    @property
+    def current(self) -> int:
+        return int(min(self.maximum, max(self.minimum, self._average * self.factor)))
+
+    def record(self, elapsed_ms: float) -> None:
+        self._average = 0.8 * self._average + 0.2 * elapsed_ms
+
+    def record_timeout(self) -> None:
+        # Treat a timeout as the slowest allowed update so the budget grows
+        self.record(self.maximum / self.factor * 2)
+
+
+GRID_READY_TIMEOUT = AdaptiveTimeout(
+    initial=ELEMENT_WAIT_TIMEOUT,
+    minimum=GRID_READY_MIN_TIMEOUT,
+    maximum=GRID_READY_MAX_TIMEOUT,
+)
+
+
+async def grid_fingerprint(page: Page) -> Optional[str]:
+    """Fingerprint the grid's current content (None if it can't be read)."""
+    try:
+        return await page.evaluate(GRID_FINGERPRINT_SCRIPT)
+    except Exception:
+        return None
+
+
+async def wait_for_grid_update(page: Page, previous: Optional[str] = None) -> Optional[str]:
+    """
+    Wait for the icon grid to update after a filter or page change.
+    `previous` is the grid fingerprint taken before the action; pass None after
+    a navigation, where any populated grid counts as new. Returns the new
+    fingerprint so the caller can chain the next wait.
+    """
+    timeout = GRID_READY_TIMEOUT.current
+    try:
+        with profile_phase("grid_wait"):
+            result = await page.evaluate(
+                GRID_READY_SCRIPT,
+                {"previous": previous, "quietMs": GRID_QUIET_MS, "timeoutMs": timeout},
+            )
+    except Exception as e:
+        print(f"  Warning: Could not wait for grid to update: {e}")
+        return None
+
+    if result["ready"]:
+        GRID_READY_TIMEOUT.record(result["elapsed"])
+    else:
+        GRID_READY_TIMEOUT.record_timeout()
+        report_timeout()
+        print(f"  Warning: Timeout waiting for grid to update ({timeout} ms)")
+    return result["fingerprint"]
 
 
 async def extract_icon_names(page: Page) -> List[str]:
@@ -70,94 +325,261 @@ async def extract_icon_names(page: Page) -> List[str]:
     return icon_names
 
 
-async def scrape_category_pages(page: Page, category_name: str) -> List[str]:
+PAGINATION_LINKS_SELECTOR = ".pagination-large-screen a, .pagination-large-screen button"
+
+# Reads every icon class string and the pagination state in one round-trip.
+# Mirrors extract_icon_names plus find_next_button/is_button_disabled below.
+# With withIcons false only the pagination state and fingerprint are read.
+GRID_SNAPSHOT_SCRIPT = """
+({ pageNum, withIcons }) => {
+""" + GRID_FINGERPRINT_FUNCTION + """
+    const icons = [];
+    if (withIcons) {
+        for (const article of document.querySelectorAll("article.wrap-icon")) {
+            const i = article.querySelector("button.icon.flat i");
+            const cls = i && i.getAttribute("class");
+            if (cls && cls.trim()) icons.push(cls.trim());
+        }
+    }
+    const links = Array.from(document.querySelectorAll(
+        ".pagination-large-screen a, .pagination-large-screen button"
+    ));
+    const text = (el) => (el.innerText || el.textContent || "").trim().toLowerCase();
+    let next = links.findIndex((el) =>
+        (el.getAttribute("aria-label") || "").toLowerCase().includes("next") ||
+        text(el).includes("next")
+    );
+    if (next === -1) {
+        next = links.findIndex((el) => text(el) === String(pageNum + 1));
+    }
+    let nextDisabled = true;
+    if (next !== -1) {
+        const el = links[next];
+        nextDisabled = el.hasAttribute("disabled") ||
+            el.getAttribute("aria-disabled") === "true" ||
+            (el.getAttribute("class") || "").includes("disabled");
+    }
+    return { icons, nextIndex: next, nextDisabled, fingerprint: gridFingerprint() };
+}
+"""
+
+
+@dataclass
+class GridSnapshot:
+    """Icons on the current grid page plus where (if anywhere) to go next."""
+    icons: List[str]
+    next_index: int = -1  # index into PAGINATION_LINKS_SELECTOR matches
+    next_disabled: bool = True
+    fingerprint: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_index >= 0 and not self.next_disabled
+
+
+async def extract_grid_snapshot(page: Page, page_num: int, with_icons: bool = True) -> GridSnapshot:
+    """
+    Batched alternative to extract_icon_names + find_next_button: one in-page
+    evaluation returns every icon class string and the pagination state.
+    With `with_icons` False the icons are left out (the network extractor only
+    needs the pagination state and the fingerprint to check its harvest).
+    """
+    try:
+        raw = await page.evaluate(GRID_SNAPSHOT_SCRIPT, {"pageNum": page_num, "withIcons": with_icons})
+    except Exception as e:
+        print(f"  Error extracting grid snapshot: {e}")
+        return GridSnapshot(icons=[])
+    return GridSnapshot(
+        icons=raw["icons"],
+        next_index=raw["nextIndex"],
+        next_disabled=raw["nextDisabled"],
+        fingerprint=raw["fingerprint"],
+    )
+
+
+async def find_next_button(page: Page, page_num: int) -> Optional[ElementHandle]:
+    """Locate the pagination control leading to page `page_num + 1`, element by element."""
+    # The pagination class is: display-none tablet:display-flex flex-content-center flex-wrap flex-items-center pagination-large-screen
+    # Try to find a "next" button or link
+    next_button = await page.query_selector(
+        ".pagination-large-screen a[aria-label*='next'], "
+        ".pagination-large-screen a[aria-label*='Next'], "
+        ".pagination-large-screen button[aria-label*='next'], "
+        ".pagination-large-screen button[aria-label*='Next'], "
+        ".pagination-large-screen a:has-text('Next'), "
+        ".pagination-large-screen button:has-text('Next')"
+    )
+    if next_button:
+        return next_button
+
+    # Alternative: look for pagination links with page numbers
+    pagination_links = await page.query_selector_all(PAGINATION_LINKS_SELECTOR)
+    for link in pagination_links:
+        text = (await link.inner_text()).strip().lower()
+        if text == str(page_num + 1) or "next" in text:
+            return link
+    return None
+
+
+async def is_button_disabled(button: ElementHandle) -> bool:
+    """Check whether a pagination control is disabled or otherwise not clickable."""
+    disabled_attr = await button.get_attribute("disabled")
+    aria_disabled = await button.get_attribute("aria-disabled")
+    class_attr = await button.get_attribute("class") or ""
+    return (
+        disabled_attr is not None or
+        aria_disabled == "true" or
+        "disabled" in class_attr
+    )
+
+
+async def go_to_next_page(
+    page: Page,
+    page_num: int,
+    snapshot: Optional[GridSnapshot],
+    previous: Optional[str],
+) -> Optional[str]:
+    """
+    Advance the grid to the next page and wait until the new page has rendered.
+    `previous` is the fingerprint of the current page.
+    Returns "next" once the next page is showing, "last" when already on the
+    last page, or None when the click failed or the grid never changed.
+    """
+    try:
+        with profile_phase("paginate"):
+            if snapshot is not None:
+                if not snapshot.has_next:
+                    return "last"
+                await page.locator(PAGINATION_LINKS_SELECTOR).nth(snapshot.next_index).click()
+            else:
+                next_button = await find_next_button(page, page_num)
+                # No next button (or a disabled one) means we're on the last page
+                if not next_button or await is_button_disabled(next_button):
+                    return "last"
+                await next_button.click()
+    except Exception as e:
+        print(f"    Warning: Could not go to next page: {e}")
+        return None
+
+    fingerprint = await wait_for_grid_update(page, previous)
+    if not fingerprint or fingerprint == previous:
+        return None
+    return "next"
+
+
+async def retry_next_page(
+    page: Page,
+    page_num: int,
+    snapshot: Optional[GridSnapshot],
+    previous: Optional[str],
+    rate: Optional[AdaptiveRateController],
+) -> Optional[str]:
+    """
+    Retry a failed page turn with exponential backoff, up to MAX_PAGE_RETRIES
+    times. Before each new click the grid is checked again, so a page that
+    arrived after the wait gave up is kept rather than skipped; it is then
+    given the usual readiness wait before it is read.
+    """
+    for attempt in range(1, MAX_PAGE_RETRIES + 1):
+        count_retry("page")
+        delay = rate.backoff_delay(attempt) if rate else DELAY_BETWEEN_PAGES * 2 ** attempt
+        print(f"    Retrying page {page_num + 1} in {delay:.1f}s (attempt {attempt}/{MAX_PAGE_RETRIES})")
+        await profiled_sleep(delay)
+        if rate:
+            await rate.wait_for_cooldown()
+
+        current = await grid_fingerprint(page)
+        if current and previous and current != previous:
+            fingerprint = await wait_for_grid_update(page, previous)
+            if fingerprint and fingerprint != previous:
+                return "next"
+        outcome = await go_to_next_page(page, page_num, snapshot, previous)
+        if outcome is not None:
+            return outcome
+    return None
+
+
+async def scrape_category_pages(
+    page: Page,
+    category_name: str,
+    harvester: Optional[IconResponseHarvester] = None,
+    extractor: str = "batch",
+    rate: Optional[AdaptiveRateController] = None,
+) -> tuple:
     """
     Scrape all icons from all pages for a given category.
-    Returns a list of icon names (full class strings).
+    Returns (icon names, complete): the full class strings, and False when a
+    page turn failed for good and the later pages are missing.
+
+    With a harvester, each page's icons come from the API response that filled
+    the grid, and the grid is only read for its pagination state and
+    fingerprint. A harvest that is empty or doesn't match the grid's
+    fingerprint (a stray autocomplete or stale response) is replaced by a full
+    grid read. Without a harvester the icons come from a single batched grid
+    snapshot, or from the per-element walk when `extractor` is "dom".
+
+    Page turns are paced by `rate` (fixed DELAY_BETWEEN_PAGES without one). A
+    page turn that fails is retried with backoff instead of ending the category.
     """
     all_icons: List[str] = []
+    complete = True
     page_num = 1
+    page_started = asyncio.get_running_loop().time()
     
     print(f"  Scraping category: {category_name}")
     
+    # The caller has already waited for the first page to render
     while True:
-        print(f"    Page {page_num}...", end=" ", flush=True)
-        
-        # Wait for grid to be ready
-        await wait_for_grid_update(page)
-        
         # Extract icons from current page
-        icons = await extract_icon_names(page)
+        snapshot: Optional[GridSnapshot] = None
+        with profile_phase("extract"):
+            if extractor == "dom":
+                icons = await extract_icon_names(page)
+                fingerprint = await grid_fingerprint(page)
+            else:
+                snapshot = await extract_grid_snapshot(page, page_num, with_icons=harvester is None)
+                icons = snapshot.icons
+                fingerprint = snapshot.fingerprint
+            if harvester:
+                harvested = await harvester.drain(category_name)
+                if harvested and icons_fingerprint(harvested) == fingerprint:
+                    icons = harvested
+                else:
+                    count_retry("network_fallback" if not harvested else "network_mismatch")
+                    snapshot = await extract_grid_snapshot(page, page_num)
+                    icons = snapshot.icons
+                    fingerprint = snapshot.fingerprint
         all_icons.extend(icons)
-        print(f"Found {len(icons)} icons")
+        print(f"    [{category_name}] Page {page_num}: found {len(icons)} icons")
         
-        # Check for next page button
-        try:
-            # Look for pagination controls
-            # The pagination class is: display-none tablet:display-flex flex-content-center flex-wrap flex-items-center pagination-large-screen
-            # Try to find a "next" button or link
-            next_button = await page.query_selector(
-                ".pagination-large-screen a[aria-label*='next'], "
-                ".pagination-large-screen a[aria-label*='Next'], "
-                ".pagination-large-screen button[aria-label*='next'], "
-                ".pagination-large-screen button[aria-label*='Next'], "
-                ".pagination-large-screen a:has-text('Next'), "
-                ".pagination-large-screen button:has-text('Next')"
-            )
-            
-            # Alternative: look for pagination links with page numbers
-            if not next_button:
-                # Try finding the current page number and look for next
-                pagination_links = await page.query_selector_all(".pagination-large-screen a, .pagination-large-screen button")
-                current_page_found = False
-                for link in pagination_links:
-                    text = (await link.inner_text()).strip().lower()
-                    if text == str(page_num + 1) or "next" in text:
-                        next_button = link
-                        current_page_found = True
-                        break
-            
-            if next_button:
-                # Check if button is disabled or not clickable
-                disabled_attr = await next_button.get_attribute("disabled")
-                aria_disabled = await next_button.get_attribute("aria-disabled")
-                class_attr = await next_button.get_attribute("class") or ""
-                is_disabled = (
-                    disabled_attr is not None or
-                    aria_disabled == "true" or
-                    "disabled" in class_attr
-                )
-                
-                if not is_disabled:
-                    try:
-                        await next_button.click()
-                        await asyncio.sleep(DELAY_BETWEEN_PAGES)
-                        page_num += 1
-                        continue
-                    except Exception as e:
-                        print(f"\n    Warning: Could not click next button: {e}")
-                        break
-                else:
-                    # Next button exists but is disabled - we're on the last page
-                    break
-            else:
-                # No next button found - assume we're on the last page
-                break
-                
-        except Exception as e:
-            print(f"\n    Warning: Error checking for next page: {e}")
+        # Politeness floor between page requests, shared by every worker when
+        # there is a rate controller; time spent waiting for the grid already
+        # counts towards it
+        elapsed = asyncio.get_running_loop().time() - page_started
+        if rate:
+            await rate.wait_for_page()
+        elif elapsed < DELAY_BETWEEN_PAGES:
+            await profiled_sleep(DELAY_BETWEEN_PAGES - elapsed)
+        page_started = asyncio.get_running_loop().time()
+        outcome = await go_to_next_page(page, page_num, snapshot, fingerprint)
+        if outcome is None:
+            outcome = await retry_next_page(page, page_num, snapshot, fingerprint, rate)
+        if outcome is None:
+            print(f"    Warning: Giving up on '{category_name}' after page {page_num}; the category is partial")
+            count_retry("page_abandoned")
+            complete = False
+        if outcome != "next":
             break
+        page_num += 1
     
-    # Remove duplicates while preserving order
-    seen: Set[str] = set()
-    unique_icons: List[str] = []
-    for icon in all_icons:
-        if icon not in seen:
-            seen.add(icon)
-            unique_icons.append(icon)
+    # Fold style variants into one record per base icon; this also removes
+    # duplicates while preserving order of first appearance
+    styles = build_style_table(all_icons)
+    records = fold_icons(all_icons, styles)
+    unique_icons = expand_icon_records(records, styles)
     
-    print(f"  Total unique icons for '{category_name}': {len(unique_icons)}")
-    return unique_icons
+    print(f"  Total unique icons for '{category_name}': {len(unique_icons)} ({len(records)} base icons)")
+    return unique_icons, complete
 
 
 def clean_category_name(category_name: str) -> str:
@@ -179,111 +601,237 @@ def clean_category_name(category_name: str) -> str:
     return cleaned
 
 
-async def find_category_buttons(page: Page) -> List[tuple]:
+# Scrolls the category sidebar to the bottom until no more categories lazy-load,
+# then reads every category input's id and the icon count shown in its label.
+# Returns null when the sidebar isn't on the page.
+CATEGORY_DISCOVERY_SCRIPT = """
+async () => {
+    const container = document.querySelector(".icons-facets-group-categories");
+    if (!container) return null;
+    const selector = "input[id^='icons-category-']";
+    let seen = -1;
+    for (let round = 0; round < 10; round++) {
+        const found = container.querySelectorAll(selector).length;
+        if (found === seen) break;
+        seen = found;
+        container.scrollTop = container.scrollHeight;
+        const items = container.querySelectorAll("li");
+        if (items.length) items[items.length - 1].scrollIntoView({ block: "end" });
+        await new Promise((resolve) => setTimeout(resolve, 150));
+    }
+    return Array.from(container.querySelectorAll(selector), (input) => {
+        const label = document.querySelector(`label[for='${input.id}']`);
+        const match = (label ? label.textContent : "").replace(/,/g, "").match(/(\\d+)\\s*\\)?\\s*$/);
+        return { id: input.id, count: match ? parseInt(match[1], 10) : null };
+    });
+}
+"""
+
+
+async def find_category_buttons(page: Page) -> tuple:
     """
-    Find all category buttons/links in the sidebar.
-    Returns a list of tuples: (input_id, category_name)
-    We store input_id instead of element references to avoid stale element issues.
+    Find all category inputs in the sidebar, and the icon count each one shows,
+    in a single in-page evaluation.
+    Returns (categories, counts): a list of (input_id, category_name) tuples and
+    category name -> sidebar count. We store input_id instead of element
+    references to avoid stale element issues.
     """
     categories: List[tuple] = []
+    counts: Dict[str, int] = {}
     
     try:
-        # Find the category sidebar
-        category_container = await page.query_selector(".icons-facets-group-categories")
-        if not category_container:
+        print("  Scrolling the category list and reading every category...")
+        entries = await page.evaluate(CATEGORY_DISCOVERY_SCRIPT)
+        if entries is None:
             print("Error: Could not find category container (.icons-facets-group-categories)")
-            return categories
-        
-        # Scroll through the category container to ensure all categories are loaded
-        # Some categories might be lazy-loaded or hidden until scrolled into view
-        print("  Scrolling through category list to load all categories...")
-        try:
-            # First, try scrolling the container itself to the bottom
-            await category_container.scroll_into_view_if_needed()
-            await asyncio.sleep(0.3)
-            
-            # Scroll through all list items to ensure they're loaded
-            # Get all list items (li elements) in the category container
-            list_items = await category_container.query_selector_all("li")
-            
-            if list_items:
-                # Scroll each item into view to trigger lazy loading
-                for i, li_item in enumerate(list_items):
-                    try:
-                        await li_item.scroll_into_view_if_needed()
-                        # Every 5 items, check if we've found more inputs
-                        if i % 5 == 0:
-                            await asyncio.sleep(0.1)
-                    except Exception:
-                        continue
-                
-                # Final scroll to bottom
-                await list_items[-1].scroll_into_view_if_needed()
-                await asyncio.sleep(0.5)  # Wait for any lazy-loaded content
-            
-        except Exception as e:
-            print(f"  Warning: Error scrolling category list: {e}")
-            # Continue anyway - might still find categories
+            return categories, counts
+        print(f"  Total input elements found: {len(entries)}")
         
-        # Find all input elements with id starting with "icons-category-"
-        # The id format is: "icons-category-{category-name}"
-        input_elements = await category_container.query_selector_all("input[id^='icons-category-']")
-        print(f"  Total input elements found: {len(input_elements)}")
-        
-        for input_element in input_elements:
-            try:
-                # Get the id attribute
-                input_id = await input_element.get_attribute("id")
-                if not input_id or not input_id.startswith("icons-category-"):
-                    continue
-                
-                # Extract category name from id (remove "icons-category-" prefix)
-                category_name = input_id.replace("icons-category-", "", 1)
-                
-                # Clean the category name to ensure consistent format
-                category_name = clean_category_name(category_name)
-                
-                # Store the input_id instead of element reference
-                # We'll re-find the element each time we need to click it
-                categories.append((input_id, category_name))
-                    
-            except Exception as e:
-                print(f"  Warning: Error processing category input: {e}")
-                continue
+        for entry in entries:
+            # The id format is: "icons-category-{category-name}"
+            input_id = entry["id"]
+            category_name = clean_category_name(input_id.replace("icons-category-", "", 1))
+            categories.append((input_id, category_name))
+            if entry["count"] is not None:
+                counts[category_name] = entry["count"]
         
     except Exception as e:
         print(f"Error finding categories: {e}")
         import traceback
         traceback.print_exc()
     
-    return categories
+    return categories, counts
 
 
-async def click_category(page: Page, input_id: str, category_name: str) -> bool:
-    """Click a category button to filter the icon grid."""
+def validate_category_counts(
+    data: Dict[str, List[str]],
+    counts: Dict[str, int],
+) -> Dict[str, Dict[str, int]]:
+    """
+    Compare each scraped category's base-icon count with the count its sidebar
+    entry showed, and return the categories where they differ.
+    """
+    mismatches: Dict[str, Dict[str, int]] = {}
+    for category_name, icons in data.items():
+        expected = counts.get(category_name)
+        scraped = len(fold_icons(icons))
+        if expected is not None and expected != scraped:
+            mismatches[category_name] = {"sidebar": expected, "scraped": scraped}
+    return mismatches
+
+
+def load_previous_run() -> tuple:
+    """
+    Load the last saved catalog and the per-category signals it was built from.
+    Returns (categories, signals). For catalogs written before signals were
+    recorded, the signals are the base-icon counts of the saved categories: the
+    unit the sidebar shows (category_counts counts every style variant).
+    """
+    categories: Dict[str, List[str]] = {}
+    signals: Dict[str, int] = {}
+    if OUTPUT_FILE.exists():
+        with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
+            categories = json.load(f).get("categories", {})
+    if CATEGORIES_METADATA_FILE.exists():
+        with open(CATEGORIES_METADATA_FILE, "r", encoding="utf-8") as f:
+            signals = json.load(f).get("category_signals") or {}
+    if not signals:
+        signals = {category_name: len(fold_icons(icons)) for category_name, icons in categories.items()}
+    return categories, signals
+
+
+def find_unchanged_categories(
+    category_names: List[str],
+    previous: Dict[str, List[str]],
+    stored_signals: Dict[str, int],
+    live_signals: Dict[str, int],
+) -> Dict[str, List[str]]:
+    """
+    The previous run's icons for every category whose live sidebar count equals
+    the one stored with them. Categories without a live or stored count are
+    always scraped again.
+    """
+    return {
+        category_name: previous[category_name]
+        for category_name in category_names
+        if category_name in previous
+        and live_signals.get(category_name) is not None
+        and stored_signals.get(category_name) == live_signals[category_name]
+    }
+
+
+def signals_to_save(result: ScrapeResult) -> Dict[str, int]:
+    """
+    The sidebar counts to store with the catalog for the next --incremental run.
+    Categories whose saved icons may not match their count are left out, so
+    the next run scrapes them again.
+    """
+    skipped = {*result.stale_categories, *result.partial_categories, *result.count_mismatches}
+    return {
+        category_name: count for category_name, count in result.category_signals.items()
+        if category_name not in skipped
+    }
+
+
+def build_change_report(
+    previous: Dict[str, List[str]],
+    current: Dict[str, List[str]],
+    scraped: List[str],
+) -> Dict:
+    """
+    Describe which icons were added to or removed from each re-scraped category.
+    A category missing from `current` is listed under removed_categories only.
+    """
+    changes: Dict[str, Dict[str, List[str]]] = {}
+    for category_name in scraped:
+        if category_name not in current:
+            continue
+        before = previous.get(category_name, [])
+        after = current.get(category_name, [])
+        before_set, after_set = set(before), set(after)
+        added = [icon for icon in after if icon not in before_set]
+        removed = [icon for icon in before if icon not in after_set]
+        if added or removed:
+            changes[category_name] = {"added": added, "removed": removed}
+    return {
+        "report_date": datetime.now().isoformat(),
+        "rescraped_categories": scraped,
+        "added_categories": [name for name in current if name not in previous],
+        "removed_categories": [name for name in previous if name not in current],
+        "changes": changes,
+    }
+
+
+def category_url(input_id: str, base_url: str = BASE_URL) -> str:
+    """Build the URL of the search view filtered to a single category."""
+    slug = input_id.replace("icons-category-", "", 1)
+    parts = urlsplit(base_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != CATEGORY_URL_PARAM]
+    query.append((CATEGORY_URL_PARAM, slug))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+async def navigate_to_category(
+    page: Page,
+    input_id: str,
+    category_name: str,
+    base_url: str = BASE_URL,
+) -> bool:
+    """
+    Load the category's filtered view directly from its URL.
+    Returns True only if the page came up with that category's filter applied,
+    so the caller can fall back to clicking when the site ignores the parameter.
+    """
+    url = category_url(input_id, base_url)
     try:
-        # Re-find the category container and element each time (avoids stale element issues)
-        category_container = await page.query_selector(".icons-facets-group-categories")
-        if not category_container:
-            print(f"  Error: Category container not found for '{category_name}'")
+        with profile_phase("navigate"):
+            await page.goto(url, wait_until="domcontentloaded", timeout=PAGE_LOAD_TIMEOUT)
+        await wait_for_grid_update(page)
+        with profile_phase("navigate"):
+            applied = await page.is_checked(f"input[id='{input_id}']", timeout=ELEMENT_WAIT_TIMEOUT)
+        if not applied:
+            print(f"  Warning: Filter not applied after loading {url}")
             return False
-        
-        # Find the label element by input_id (re-find it each time)
-        label_element = await category_container.query_selector(f"label[for='{input_id}']")
-        if not label_element:
-            # Fallback: try the input element itself
-            label_element = await category_container.query_selector(f"input[id='{input_id}']")
+        print(f"  Loaded category: {category_name}")
+        return True
+    except Exception as e:
+        if isinstance(e, PlaywrightTimeoutError):
+            report_timeout()
+        print(f"  Warning: Could not load category '{category_name}' by URL: {e}")
+        return False
+
+
+async def find_category_element(page: Page, input_id: str) -> Optional[ElementHandle]:
+    """
+    Find the clickable label (or, failing that, the input) for a category.
+    Re-finds the container and element each time to avoid stale element issues.
+    """
+    category_container = await page.query_selector(".icons-facets-group-categories")
+    if not category_container:
+        return None
+    
+    # Find the label element by input_id (re-find it each time)
+    label_element = await category_container.query_selector(f"label[for='{input_id}']")
+    if not label_element:
+        # Fallback: try the input element itself
+        label_element = await category_container.query_selector(f"input[id='{input_id}']")
+    return label_element
+
+
+async def click_category(page: Page, input_id: str, category_name: str) -> bool:
+    """Click a category button and wait for the icon grid to show the filtered icons."""
+    try:
+        with profile_phase("click"):
+            label_element = await find_category_element(page, input_id)
             if not label_element:
                 print(f"  Error: Could not find element for category '{category_name}' (id: {input_id})")
                 return False
-        
-        # Scroll element into view
-        await label_element.scroll_into_view_if_needed()
-        await asyncio.sleep(0.2)
-        
-        # Click the element
-        await label_element.click()
-        await asyncio.sleep(0.3)
+            
+            # Click the element (Playwright scrolls it into view and waits until
+            # it is actionable), then wait for the grid content to change
+            previous = await grid_fingerprint(page)
+            await label_element.click()
+        await wait_for_grid_update(page, previous)
         
         print(f"  Clicked category: {category_name}")
         return True
@@ -295,29 +843,18 @@ async def click_category(page: Page, input_id: str, category_name: str) -> bool:
 async def unclick_category(page: Page, input_id: str, category_name: str) -> bool:
     """Unclick/deselect a category to reset the filter."""
     try:
-        # Re-find the category container and element each time (avoids stale element issues)
-        category_container = await page.query_selector(".icons-facets-group-categories")
-        if not category_container:
+        with profile_phase("reset"):
+            label_element = await find_category_element(page, input_id)
+            if label_element:
+                # Try clicking again to toggle off
+                previous = await grid_fingerprint(page)
+                await label_element.click()
+        if not label_element:
             # Try alternative: look for a clear/reset button
             return await try_clear_filters(page)
         
-        # Find the label element by input_id (re-find it each time)
-        label_element = await category_container.query_selector(f"label[for='{input_id}']")
-        if not label_element:
-            # Fallback: try the input element itself
-            label_element = await category_container.query_selector(f"input[id='{input_id}']")
-            if not label_element:
-                # Try clear button as fallback
-                return await try_clear_filters(page)
-        
-        # Try clicking again to toggle off
-        await label_element.scroll_into_view_if_needed()
-        await asyncio.sleep(0.2)
-        await label_element.click()
-        await asyncio.sleep(0.3)
-        
         # Wait for grid to reset
-        await wait_for_grid_update(page)
+        await wait_for_grid_update(page, previous)
         return True
     except Exception as e:
         print(f"  Warning: Error unclicking category '{category_name}': {e}")
@@ -328,156 +865,706 @@ async def unclick_category(page: Page, input_id: str, category_name: str) -> boo
 async def try_clear_filters(page: Page) -> bool:
     """Try to find and click a clear/reset filters button."""
     try:
-        clear_button = await page.query_selector(
-            "button[aria-label*='clear'], "
-            "button[aria-label*='Clear'], "
-            "button:has-text('Clear'), "
-            ".filter-reset, "
-            "[data-clear-filters]"
-        )
+        with profile_phase("reset"):
+            clear_button = await page.query_selector(
+                "button[aria-label*='clear'], "
+                "button[aria-label*='Clear'], "
+                "button:has-text('Clear'), "
+                ".filter-reset, "
+                "[data-clear-filters]"
+            )
+            if clear_button:
+                previous = await grid_fingerprint(page)
+                await clear_button.click()
         if clear_button:
-            await clear_button.click()
-            await wait_for_grid_update(page)
+            await wait_for_grid_update(page, previous)
             return True
     except Exception:
         pass
     return False
 
 
-async def scrape_all_categories() -> Dict[str, List[str]]:
+async def select_category(session: PageSession, input_id: str, category_name: str) -> Optional[str]:
+    """
+    Filter the grid to a single category.
+    Returns how it was selected ("url" or "click"), or None if it could not be.
+
+    In "url" mode the filtered view is loaded directly, so there is no filter
+    to reset afterwards; if that fails the sidebar click path is used instead.
+    """
+    page, harvester = session.page, session.harvester
+    if session.options.navigation == "url":
+        if await navigate_to_category(page, input_id, category_name, session.options.base_url):
+            return "url"
+        print(f"  Falling back to clicking category '{category_name}'")
+        count_retry("url_fallback")
+        if harvester:
+            harvester.reset()
+
+    # Click the category (re-finds element each time to avoid stale references)
+    if await click_category(page, input_id, category_name):
+        return "click"
+    return None
+
+
+async def scrape_category(session: PageSession, input_id: str, category_name: str) -> Optional[tuple]:
+    """
+    Filter the grid to a single category and scrape it.
+    Returns (icons, complete) as scrape_category_pages does, or None if the
+    category could not be selected.
+    Requests, bytes transferred and page-load time are recorded in `session.stats`.
+    """
+    page, harvester = session.page, session.harvester
+    if harvester:
+        harvester.reset()
+
+    loop = asyncio.get_running_loop()
+    requests_before, bytes_before = await session.traffic.settle()
+    started = loop.time()
+
+    selected_by = await select_category(session, input_id, category_name)
+    if selected_by is None:
+        print(f"  Skipping category '{category_name}' due to click failure")
+        return None
+    load_ms = (loop.time() - started) * 1000
+
+    # Scrape all icons from all pages for this category
+    icons, complete = await scrape_category_pages(
+        page, category_name, harvester, session.options.extractor, session.rate
+    )
+    if not icons:
+        print(f"  Warning: No icons found for category '{category_name}'")
+
+    if selected_by == "click":
+        # Unclick the category to reset (re-finds element each time)
+        await unclick_category(page, input_id, category_name)
+
+    requests_after, bytes_after = await session.traffic.settle()
+    stats = {
+        "requests": requests_after - requests_before,
+        "bytes": bytes_after - bytes_before,
+        "load_ms": round(load_ms, 1),
+        "total_ms": round((loop.time() - started) * 1000, 1),
+    }
+    session.stats[category_name] = stats
+    print(
+        f"  Traffic: {stats['bytes'] / 1024:.1f} KB in {stats['requests']} requests, "
+        f"page load {stats['load_ms']:.0f} ms"
+    )
+    return icons, complete
+
+
+# Async setup run on every new page before it navigates (CDP-based meters, blocking)
+PageHook = Callable[[BrowserContext, Page], Awaitable[None]]
+
+
+async def new_page(context: BrowserContext, options: ScrapeOptions, hooks: Sequence[PageHook] = ()) -> Page:
+    """Open a page in the run's context, applying the page hooks and the options' page wrapper."""
+    page = await context.new_page()
+    for hook in hooks:
+        try:
+            await hook(context, page)
+        except Exception as e:
+            print(f"  Warning: Page setup failed: {e}")
+    return options.wrap_page(page) if options.wrap_page else page
+
+
+async def open_worker_page(
+    context: BrowserContext,
+    options: ScrapeOptions,
+    hooks: Sequence[PageHook] = (),
+) -> Page:
+    """Open an extra page on the search view for a worker to scrape from."""
+    page = await new_page(context, options, hooks)
+    with profile_phase("startup"):
+        await page.goto(options.base_url, wait_until="domcontentloaded", timeout=PAGE_LOAD_TIMEOUT)
+    await wait_for_grid_update(page)
+    return page
+
+
+async def category_worker(
+    worker_id: int,
+    session: PageSession,
+    queue: "asyncio.Queue[tuple]",
+    results: Dict[int, List[str]],
+    rate: AdaptiveRateController,
+    total: int,
+    journal: CheckpointJournal,
+    profiler: RunProfiler,
+    partial: List[str],
+) -> None:
+    """
+    Pull categories off the shared queue until it is empty. Complete categories
+    are journaled; partial ones are kept in `results` but only listed in
+    `partial`, so a --resume run scrapes them again.
+    """
+    while True:
+        try:
+            idx, input_id, category_name = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+
+        try:
+            with profiler.scope(category_name, worker_id), rate.active():
+                await rate.wait_for_category()
+                print(f"\n[{idx}/{total}] (worker {worker_id}) Processing category: {category_name}")
+                scraped = await scrape_category(session, input_id, category_name)
+        except Exception as e:
+            print(f"  Error scraping category '{category_name}': {e}")
+            continue
+        if scraped is None:
+            continue
+        icons, complete = scraped
+        if icons:
+            results[idx] = icons
+            if complete:
+                journal.record(input_id, category_name, icons)
+            else:
+                partial.append(category_name)
+
+
+async def open_browser_context(playwright: Playwright, options: ScrapeOptions) -> tuple:
+    """
+    Launch Chromium and return (browser, context). With `options.profile_dir`
+    the context is persistent, keeping cookies and the HTTP cache on disk
+    between runs; the context then owns the browser and browser is None.
+    """
+    context_options = {
+        "viewport": {"width": 1920, "height": 1080},
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        # Service workers would bypass the routes ResourceBlocker installs
+        "service_workers": "block" if options.lean else "allow",
+    }
+    if options.profile_dir:
+        options.profile_dir.mkdir(parents=True, exist_ok=True)
+        context = await playwright.chromium.launch_persistent_context(
+            str(options.profile_dir),
+            headless=True,
+            args=[f"--disk-cache-dir={options.profile_dir.resolve() / 'cache'}"],
+            **context_options,
+        )
+        return None, context
+    browser: Browser = await playwright.chromium.launch(headless=True)
+    return browser, await browser.new_context(**context_options)
+
+
+async def scrape_all_categories(options: Optional[ScrapeOptions] = None) -> ScrapeResult:
     """
     Main scraping function.
-    Returns a dictionary with category names as keys and lists of icon names as values.
+    Returns a ScrapeResult whose `categories` maps category names to lists of icon names.
+
+    With `options.workers` > 1 the categories are spread over that many pages
+    (capped at MAX_WORKERS). Every page keeps its own filter state, a shared
+    AdaptiveRateController paces category starts and page turns by how the
+    site is responding, and the result is assembled in sidebar order so the
+    output matches a single-page run.
+
+    Every finished category is journaled to `options.checkpoint_file`; with
+    `options.resume` the categories already in the journal are not scraped again.
+    With `options.incremental`, categories whose sidebar count matches the
+    signal stored by the previous run are taken from the previous output.
     """
-    result: Dict[str, List[str]] = {}
+    options = options or ScrapeOptions()
+    result = ScrapeResult()
+    rate = AdaptiveRateController(options.category_delay, options.page_delay)
     
     async with async_playwright() as p:
         print("Launching browser...")
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        )
-        page = await context.new_page()
+        browser, context = await open_browser_context(p, options)
+        if options.profile_dir:
+            print(f"Using persistent profile {options.profile_dir}")
+        await context.add_init_script(READINESS_INIT_SCRIPT)
+        cache = CacheMeter()
+        hooks: List[PageHook] = [cache.watch]
+        if options.har_path:
+            # Registered before the blocker, whose allowed requests fall back to it
+            await context.route_from_har(
+                options.har_path,
+                update=options.har_mode == "record",
+                not_found="fallback",
+            )
+            print(f"HAR {options.har_mode}: {options.har_path}")
+        blocker: Optional[ResourceBlocker] = None
+        if options.lean:
+            blocker = ResourceBlocker(options.allowed_hosts)
+            if options.profile_dir:
+                # Routing would disable the HTTP cache the profile is kept for
+                hooks.append(blocker.install_on_page)
+            else:
+                await blocker.install(context)
+        page = await new_page(context, options, hooks)
         
         try:
-            print(f"Navigating to {BASE_URL}...")
-            await page.goto(BASE_URL, wait_until="networkidle", timeout=PAGE_LOAD_TIMEOUT)
-            print("Page loaded, waiting for content...")
-            await asyncio.sleep(2)  # Additional wait for dynamic content
-            
-            # Find all category buttons
-            print("\nFinding categories...")
-            categories = await find_category_buttons(page)
+            with result.profile.scope():
+                print(f"Navigating to {options.base_url}...")
+                with profile_phase("startup"):
+                    await page.goto(options.base_url, wait_until="domcontentloaded", timeout=PAGE_LOAD_TIMEOUT)
+                print("Page loaded, waiting for content...")
+                await wait_for_grid_update(page)
+                
+                # Find all category buttons
+                print("\nFinding categories...")
+                with profile_phase("discover"):
+                    categories, result.category_signals = await find_category_buttons(page)
             print(f"Found {len(categories)} categories")
+            result.all_categories = [category_name for _, category_name in categories]
+            if options.shard:
+                index, count = options.shard
+                shards = assign_shards(result.all_categories, count)
+                categories = [
+                    (input_id, category_name) for input_id, category_name in categories
+                    if shards[category_name] == index
+                ]
+                print(f"Shard {index}/{count}: {len(categories)} categories")
             
             if not categories:
-                print("ERROR: No categories found! Check the selector.")
+                if result.all_categories:
+                    print("Nothing to scrape in this shard")
+                else:
+                    print("ERROR: No categories found! Check the selector.")
                 return result
             
-            # Process each category
+            worker_count = max(1, min(options.workers, MAX_WORKERS, len(categories)))
+            pages = [page]
+            if worker_count > 1:
+                print(f"Opening {worker_count - 1} additional worker pages...")
+                with result.profile.scope():
+                    extra_pages = await asyncio.gather(
+                        *(open_worker_page(context, options, hooks) for _ in range(worker_count - 1)),
+                        return_exceptions=True,
+                    )
+                for extra_page in extra_pages:
+                    if isinstance(extra_page, Exception):
+                        print(f"  Warning: Could not open worker page: {extra_page}")
+                    else:
+                        pages.append(extra_page)
+            
+            journal = CheckpointJournal(options.checkpoint_file)
+            completed: Dict[str, List[str]] = {}
+            if options.resume:
+                completed = journal.load()
+                print(f"Resuming: {len(completed)} categories already in {journal.path}")
+            else:
+                journal.reset()
+            
+            if options.incremental:
+                previous, stored_signals = load_previous_run()
+                unchanged = find_unchanged_categories(
+                    [category_name for _, category_name in categories if category_name not in completed],
+                    previous,
+                    stored_signals,
+                    result.category_signals,
+                )
+                print(f"Incremental: {len(unchanged)} of {len(categories)} categories unchanged")
+                completed.update(unchanged)
+            
+            queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+            scraped: Dict[int, List[str]] = {}
+            queued: List[tuple] = []
             for idx, (input_id, category_name) in enumerate(categories, 1):
-                print(f"\n[{idx}/{len(categories)}] Processing category: {category_name}")
-                
-                # Click the category (re-finds element each time to avoid stale references)
-                if not await click_category(page, input_id, category_name):
-                    print(f"  Skipping category '{category_name}' due to click failure")
-                    continue
-                
-                # Wait for grid to update
-                await wait_for_grid_update(page)
-                
-                # Scrape all icons from all pages for this category
-                icons = await scrape_category_pages(page, category_name)
-                
-                if icons:
-                    result[category_name] = icons
+                if category_name in completed:
+                    scraped[idx] = completed[category_name]
                 else:
-                    print(f"  Warning: No icons found for category '{category_name}'")
-                
-                # Unclick the category to reset (re-finds element each time)
-                await unclick_category(page, input_id, category_name)
-                
-                # Delay before next category
-                if idx < len(categories):
-                    await asyncio.sleep(DELAY_BETWEEN_CATEGORIES)
+                    queue.put_nowait((idx, input_id, category_name))
+                    queued.append((idx, category_name))
+            
+            await asyncio.gather(*(
+                category_worker(
+                    worker_id,
+                    PageSession.attach(worker_page, options, result.category_stats, rate),
+                    queue,
+                    scraped,
+                    rate,
+                    len(categories),
+                    journal,
+                    result.profile,
+                    result.partial_categories,
+                )
+                for worker_id, worker_page in enumerate(pages, 1)
+            ))
+            result.scraped_categories = [category_name for idx, category_name in queued if idx in scraped]
+            
+            if options.incremental:
+                # A changed category that fails to scrape keeps its previous icons
+                # instead of dropping out of the catalog
+                for idx, category_name in queued:
+                    if idx not in scraped and category_name in previous:
+                        scraped[idx] = previous[category_name]
+                        result.stale_categories.append(category_name)
+                if result.stale_categories:
+                    print(f"\n⚠️  {len(result.stale_categories)} changed categories failed to scrape "
+                          f"and keep their previous icons:")
+                    print(f"   {', '.join(result.stale_categories)}")
+            
+            # Merge in sidebar order so the output does not depend on scheduling
+            for idx, (_, category_name) in enumerate(categories, 1):
+                if idx in scraped:
+                    result.categories[category_name] = scraped[idx]
+            
+            partial = set(result.partial_categories)
+            result.partial_categories = [name for name in result.categories if name in partial]
+            if partial:
+                print(f"\n⚠️  {len(partial)} categories are partial (rerun with --resume to complete them):")
+                print(f"   {', '.join(result.partial_categories)}")
+            
+            result.count_mismatches = validate_category_counts(result.categories, result.category_signals)
+            if result.count_mismatches:
+                print(f"\n⚠️  {len(result.count_mismatches)} categories differ from their sidebar count:")
+                for category_name, entry in result.count_mismatches.items():
+                    print(f"   {category_name}: sidebar {entry['sidebar']}, scraped {entry['scraped']}")
             
         except Exception as e:
             print(f"\nFatal error during scraping: {e}")
             import traceback
             traceback.print_exc()
         finally:
-            await browser.close()
+            result.profile.finish()
+            result.rate_control = rate.summary()
+            result.cache = cache.summary()
+            if blocker:
+                result.blocked_requests = blocker.blocked
+            # Closing the context flushes a recorded HAR and the profile to disk
+            await context.close()
+            if browser:
+                await browser.close()
     
     return result
 
 
-def save_results(data: Dict[str, List[str]]) -> None:
-    """Save the scraped data to a JSON file."""
+def save_results(
+    data: Dict[str, List[str]],
+    signals: Optional[Dict[str, int]] = None,
+    minify: bool = False,
+) -> None:
+    """
+    Save the scraped data to a JSON file (skipping the write if nothing changed),
+    then build every derived artifact from it through the generator's pipeline.
+    """
     metadata = {
         "scrape_date": datetime.now().isoformat(),
         "total_categories": len(data),
         "total_icons": sum(len(icons) for icons in data.values()),
+        "total_icon_records": count_icon_records(data),
     }
     
-    # Save full data with icons
-    output = {
-        "metadata": metadata,
-        "categories": data
-    }
-    
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n✅ Results saved to {OUTPUT_FILE}")
+    # Save full data with icons, streamed one category at a time
+    print()
+    report_write(write_catalog(OUTPUT_FILE, metadata, data.items(), minify), "Results", OUTPUT_FILE)
     print(f"   Categories: {metadata['total_categories']}")
-    print(f"   Total icons: {metadata['total_icons']}")
+    print(f"   Total icons: {metadata['total_icons']} ({metadata['total_icon_records']} base-icon records)")
     
-    # Save category names and metadata separately
-    save_categories_metadata(data, metadata)
+    # Metadata (with the live sidebar counts), compact catalog, search index and
+    # shards: the registered DERIVED_OUTPUTS decide which artifacts exist
+    print()
+    if not build_outputs(minify, signals=signals or {}):
+        raise ValueError(f"{OUTPUT_FILE.name} failed validation; derived outputs were not built")
 
 
-def save_categories_metadata(data: Dict[str, List[str]], metadata: Dict) -> None:
-    """Save category names and metadata to a separate JSON file."""
-    # Extract just the category names (sorted)
-    category_names = sorted(data.keys())
-    
-    # Create output with metadata and category list
+def save_partial_results(
+    result: ScrapeResult,
+    shard: tuple,
+    minify: bool = False,
+) -> Path:
+    """Write one shard's categories, plus the full sidebar list, for merge_partial_results."""
+    path = shard_file(OUTPUT_FILE, shard)
+    data = result.categories
     output = {
-        "metadata": metadata,
-        "category_names": category_names,
-        "category_counts": {
-            category: len(icons) for category, icons in sorted(data.items())
-        }
+        "metadata": {
+            "scrape_date": datetime.now().isoformat(),
+            "total_categories": len(data),
+            "total_icons": sum(len(icons) for icons in data.values()),
+        },
+        "shard": {"index": shard[0], "count": shard[1]},
+        "all_categories": result.all_categories,
+        "partial_categories": result.partial_categories,
+        "category_signals": {
+            category: count for category, count in signals_to_save(result).items()
+            if category in data
+        },
+        "categories": data,
     }
-    
-    with open(CATEGORIES_METADATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
-    
-    print(f"✅ Categories metadata saved to {CATEGORIES_METADATA_FILE}")
-    print(f"   Category names: {len(category_names)}")
+    print()
+    report_write(write_json_artifact(path, output, minify), f"Shard {shard[0]}/{shard[1]} results", path)
+    print(f"   Categories: {len(data)}, icons: {output['metadata']['total_icons']}")
+    return path
+
+
+def print_traffic_summary(result: ScrapeResult) -> None:
+    """Summarize bytes transferred and page-load times over the scraped categories."""
+    stats = result.category_stats.values()
+    total_bytes = sum(entry["bytes"] for entry in stats)
+    total_requests = sum(entry["requests"] for entry in stats)
+    average_load = sum(entry["load_ms"] for entry in stats) / len(stats)
+    print(f"\nTraffic over {len(stats)} categories:")
+    print(f"   Transferred: {total_bytes / 1024 / 1024:.2f} MB in {total_requests} requests")
+    print(f"   Average page load: {average_load:.0f} ms")
+    print(f"   Blocked requests: {result.blocked_requests}")
+
+
+def build_run_report(result: ScrapeResult, options: ScrapeOptions) -> Dict:
+    """Combine phase timings, traffic and retries into one machine-readable report."""
+    summary = result.profile.summary(
+        {category: len(icons) for category, icons in result.categories.items()}
+    )
+    for category, stats in result.category_stats.items():
+        summary["categories"].setdefault(category, {})["traffic"] = stats
+    return {
+        "run_date": datetime.now().isoformat(),
+        "options": {
+            key: value for key, value in vars(options).items()
+            if key != "wrap_page"
+        },
+        "blocked_requests": result.blocked_requests,
+        "count_mismatches": result.count_mismatches,
+        "partial_categories": result.partial_categories,
+        "stale_categories": result.stale_categories,
+        "rate_control": result.rate_control,
+        "cache": result.cache,
+        **summary,
+    }
+
+
+def save_run_report(
+    report: Dict,
+    trace: Optional[Path],
+    profiler: RunProfiler,
+    path: Path = RUN_REPORT_FILE,
+) -> None:
+    """Write the run report (and optionally a Chrome trace) and summarize it."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+
+    print(f"✅ Run report saved to {path}")
+    print(f"   Wall time: {report['wall_ms'] / 1000:.1f}s "
+          f"(work {report['work_ms'] / 1000:.1f}s, sleep {report['sleep_ms'] / 1000:.1f}s across workers)")
+    print(f"   Icons/second: {report['icons_per_second']}, retries: {report['retries']}")
+    cache = report["cache"]
+    if cache and cache["requests"]:
+        print(f"   Browser cache: {cache['from_cache']}/{cache['requests']} responses "
+              f"({cache['hit_rate']:.0%}), {cache['network_bytes'] / 1024 / 1024:.2f} MB over the network")
+    rate = report["rate_control"]
+    if rate:
+        print(f"   Delay factor: {rate['final_factor']} (range {rate['min_factor']}-{rate['max_factor']}), "
+              f"throttled: {rate['throttled']}, server errors: {rate['server_errors']}, "
+              f"timeouts: {rate['timeouts']}")
+    for phase, ms in sorted(report["phases_ms"].items(), key=lambda item: -item[1]):
+        print(f"   {phase:<10} {ms / 1000:>8.2f}s")
+
+    if trace:
+        with open(trace, "w", encoding="utf-8") as f:
+            json.dump(profiler.trace_events(), f)
+        print(f"✅ Trace saved to {trace} (open in chrome://tracing or Perfetto)")
+
+
+def save_change_report(report: Dict, path: Path = CHANGES_REPORT_FILE) -> None:
+    """Write the incremental run's change report and summarize it."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
 
+    print(f"✅ Change report saved to {path}")
+    print(f"   Re-scraped categories: {len(report['rescraped_categories'])}")
+    for category_name, change in report["changes"].items():
+        print(f"   {category_name}: +{len(change['added'])} / -{len(change['removed'])}")
 
-async def main():
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Scrape FontAwesome icon categories.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            f"number of pages scraping categories concurrently (max {MAX_WORKERS}); category "
+            "starts and page turns stay spaced by the shared delays"
+        ),
+    )
+    parser.add_argument(
+        "--category-delay",
+        type=float,
+        default=DELAY_BETWEEN_CATEGORIES,
+        help="starting seconds between category starts, shared by all workers and adapted to the site",
+    )
+    parser.add_argument(
+        "--page-delay",
+        type=float,
+        default=DELAY_BETWEEN_PAGES,
+        help="starting seconds between page turns, shared by all workers and adapted to the site",
+    )
+    parser.add_argument(
+        "--navigation",
+        choices=("url", "click"),
+        default="url",
+        help="load each category from its filtered URL (falls back to clicking) or click the sidebar",
+    )
+    parser.add_argument(
+        "--extractor",
+        choices=("batch", "network", "dom"),
+        default="batch",
+        help=(
+            "snapshot the grid in one evaluation, read icons from the page's search API "
+            "responses (checked against the grid), or walk the grid element by element"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"skip categories already recorded in {CHECKPOINT_FILE.name} by an earlier run",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"only re-scrape categories whose sidebar count changed; writes {CHANGES_REPORT_FILE.name}",
+    )
+    parser.add_argument(
+        "--no-lean",
+        dest="lean",
+        action="store_false",
+        help="load every resource instead of blocking images, fonts, media and third-party hosts",
+    )
+    parser.add_argument(
+        "--allow-host",
+        action="append",
+        default=[],
+        metavar="HOST",
+        help="additional host (and its subdomains) the lean profile may load from; repeatable",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=BASE_URL,
+        help="search page to scrape (e.g. a local fontawesome_fixture_server.py)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard_spec,
+        metavar="i/N",
+        help=(
+            "only scrape shard i of N (1-based) and write a partial output; "
+            "run every shard, then combine them with --merge"
+        ),
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="*",
+        type=Path,
+        metavar="PARTIAL",
+        help=(
+            "don't scrape: merge shard outputs (default: every "
+            f"{OUTPUT_FILE.stem}.shard-*-of-*.json) into the canonical output and metadata"
+        ),
+    )
+    parser.add_argument(
+        "--persistent-profile",
+        nargs="?",
+        type=Path,
+        const=BROWSER_PROFILE_DIR,
+        metavar="DIR",
+        help=(
+            f"keep the browser profile and HTTP cache in DIR (default {BROWSER_PROFILE_DIR.name}) "
+            "so repeated runs reuse downloaded scripts and styles"
+        ),
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        help="also export the run's phases as a Chrome trace-event JSON file",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="write the catalog, metadata and shard manifest without indentation",
+    )
+    return parser.parse_args(argv)
+
+
+def merge_main(args: argparse.Namespace) -> None:
+    """Merge shard outputs into the canonical output, or report why they can't be."""
+    paths = args.merge or sorted(OUTPUT_FILE.parent.glob(f"{OUTPUT_FILE.stem}.shard-*-of-*.json"))
+    print(f"Merging {len(paths)} shard outputs...")
+    try:
+        data, signals, partial = merge_partial_results(paths)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"\n❌ Cannot merge shard outputs: {e}")
+        raise SystemExit(1)
+    save_results(data, signals, args.minify)
+    if partial:
+        print(f"\n⚠️  {len(partial)} categories are partial (rerun their shards with --resume, then merge again):")
+        print(f"   {', '.join(partial)}")
+    print("\n✅ Merge completed successfully!")
+
+
+async def main(args: Optional[argparse.Namespace] = None):
     """Main entry point."""
+    args = args or parse_args([])
+    if args.merge is not None:
+        merge_main(args)
+        return
+
+    shard = args.shard
+    profile_dir = args.persistent_profile
+    if shard and profile_dir:
+        # Chromium locks a profile directory, so concurrent shards each need their own
+        profile_dir = profile_dir.with_name(f"{profile_dir.name}-shard-{shard[0]}-of-{shard[1]}")
+    options = ScrapeOptions(
+        workers=args.workers,
+        category_delay=args.category_delay,
+        page_delay=args.page_delay,
+        navigation=args.navigation,
+        extractor=args.extractor,
+        resume=args.resume,
+        incremental=args.incremental,
+        lean=args.lean,
+        allowed_hosts=DEFAULT_ALLOWED_HOSTS + tuple(args.allow_host),
+        base_url=args.base_url,
+        checkpoint_file=shard_file(CHECKPOINT_FILE, shard),
+        profile_dir=profile_dir,
+        shard=shard,
+    )
+
     print("=" * 60)
     print("FontAwesome Category Scraper")
     print("=" * 60)
     print()
     
     try:
+        previous_categories = load_previous_run()[0] if options.incremental else {}
+
         # Scrape all categories
-        data = await scrape_all_categories()
+        result = await scrape_all_categories(options)
+        data = result.categories
         
-        if data:
-            # Save results
-            save_results(data)
+        if result.category_stats:
+            print_traffic_summary(result)
+        save_run_report(
+            build_run_report(result, options), args.trace, result.profile, shard_file(RUN_REPORT_FILE, shard)
+        )
+
+        # A shard writes its partial output even when it has no categories, so
+        # --merge can tell an empty shard from one that never ran
+        if data or (shard and result.all_categories):
+            # Save results (a shard only writes its partial output)
+            if shard:
+                save_partial_results(result, shard, args.minify)
+            else:
+                save_results(data, signals_to_save(result), args.minify)
+            journal = CheckpointJournal(options.checkpoint_file)
+            if result.partial_categories:
+                print(f"   Keeping {journal.path.name}: rerun with --resume to complete the partial categories")
+            else:
+                # Everything is saved; a later --resume must not reuse this run's categories
+                journal.reset()
+            if options.incremental:
+                save_change_report(
+                    build_change_report(previous_categories, data, result.scraped_categories),
+                    shard_file(CHANGES_REPORT_FILE, shard),
+                )
             print("\n✅ Scraping completed successfully!")
         else:
             print("\n❌ No data collected. Check the selectors and page structure.")
             
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\n\n⚠️  Scraping interrupted by user")
+        print(f"   Finished categories are kept in {options.checkpoint_file}; rerun with --resume")
     except Exception as e:
         print(f"\n\n❌ Fatal error: {e}")
         import traceback
@@ -485,4 +1572,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main(parse_args()))
+    except KeyboardInterrupt:
+        pass  # main() has already reported the interrupt
@@ -0,0 +1,68 @@
+"""
+Checkpoint journal for the FontAwesome category scraper.
+
+Finished categories are appended to a JSONL file as they complete, so an
+interrupted run can be resumed with --resume.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of finished categories.
+    Each category is written (and fsynced) as soon as it completes, so a crash
+    or interrupt only loses the categories that were still in progress.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> Dict[str, List[str]]:
+        """
+        Read every fully written entry. A torn last line (a crash mid-write) is
+        cut off the file, so the next record() starts on a line of its own.
+        """
+        completed: Dict[str, List[str]] = {}
+        if not self.path.exists():
+            return completed
+        with open(self.path, "rb+") as f:
+            body = f.read()
+            end = body.rfind(b"\n") + 1
+            if end < len(body):
+                try:
+                    json.loads(body[end:])
+                except ValueError:
+                    f.truncate(end)
+                else:
+                    # Only the newline is missing; keep the entry
+                    f.write(b"\n")
+                    end = len(body)
+        for line in body[:end].decode("utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            completed[entry["category"]] = entry["icons"]
+        return completed
+
+    def reset(self) -> None:
+        """Start a fresh journal, discarding any previous run."""
+        self.path.unlink(missing_ok=True)
+
+    def record(self, input_id: str, category_name: str, icons: List[str]) -> None:
+        """Append one finished category."""
+        entry = {
+            "category": category_name,
+            "input_id": input_id,
+            "icons": icons,
+            "completed_at": datetime.now().isoformat(),
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,252 @@
+"""
+Network helpers for the FontAwesome category scraper.
+
+- IconResponseHarvester reads icons out of the search API responses a page
+  fetches to fill its grid (see parse_search_payload);
+- ResourceBlocker keeps the lean profile lean, by routing on a fresh profile or
+  through the DevTools protocol on a persistent one;
+- CacheMeter tallies responses served from the browser's HTTP cache, and
+  TrafficMeter the requests and bytes a page transfers.
+"""
+
+import asyncio
+from typing import Any, Dict, Iterator, List, Optional, Set
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, CDPSession, Page, Request, Response, Route
+
+# Lean profile: resource types that are never needed to read icon class strings,
+# and the hosts (plus their subdomains) that requests are allowed to reach
+BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+# With a persistent profile, routing would disable the HTTP cache, so the lean
+# profile blocks these URL patterns through the DevTools protocol instead
+BLOCKED_URL_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm", "*.mp3",
+)
+DEFAULT_ALLOWED_HOSTS = ("fontawesome.com", "algolia.net", "algolianet.com")
+# URL fragments of the search/listing API calls the page makes to fill the grid
+SEARCH_RESPONSE_PATTERNS = ("algolia.net", "algolianet.com", "/api/search", "/api/graphql")
+
+
+def _iter_search_hits(payload: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every icon-like record found anywhere in a search API payload."""
+    if isinstance(payload, dict):
+        if isinstance(payload.get("id") or payload.get("name"), str) and (
+            "membership" in payload or "familyStylesByLicense" in payload or "styles" in payload
+        ):
+            yield payload
+            return
+        for value in payload.values():
+            yield from _iter_search_hits(value)
+    elif isinstance(payload, list):
+        for item in payload:
+            yield from _iter_search_hits(item)
+
+
+def parse_search_payload(payload: Any, category_slug: Optional[str] = None) -> List[str]:
+    """
+    Turn a search API payload into the same class strings the grid renders.
+    Only free classic styles are kept. When `category_slug` is given, hits that
+    carry category data for other categories are dropped (stale responses).
+    """
+    icon_names: List[str] = []
+    for hit in _iter_search_hits(payload):
+        name = hit.get("id") or hit.get("name")
+        categories = hit.get("categories")
+        if category_slug and isinstance(categories, list) and categories:
+            if category_slug not in categories:
+                continue
+
+        family_styles = (hit.get("familyStylesByLicense") or {}).get("free")
+        if isinstance(family_styles, list):
+            pairs = [
+                (fs.get("family", "classic"), fs.get("style"))
+                for fs in family_styles
+                if isinstance(fs, dict)
+            ]
+        else:
+            membership = hit.get("membership") or {}
+            styles = membership.get("free") if isinstance(membership, dict) else None
+            if styles is None:
+                styles = hit.get("styles") or []
+            pairs = [("classic", style) for style in styles if isinstance(style, str)]
+
+        for family, style in pairs:
+            if family == "classic" and style:
+                icon_names.append(f"fa-classic fa-{style} fa-{name}")
+    return icon_names
+
+
+class IconResponseHarvester:
+    """
+    Captures the search/listing API responses a page fetches and parses icons
+    out of them, so the grid does not have to be walked element by element.
+    """
+
+    def __init__(self, page: Page):
+        self._payloads: List[Any] = []
+        self._pending: Set[asyncio.Future] = set()
+        # Bumped by reset(); a response that arrived before the reset but whose
+        # body is read after it belongs to the old filter and is dropped
+        self._generation = 0
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Response) -> None:
+        if response.request.resource_type not in ("fetch", "xhr"):
+            return
+        if not any(pattern in response.url for pattern in SEARCH_RESPONSE_PATTERNS):
+            return
+        task = asyncio.ensure_future(self._collect(response, self._generation))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _collect(self, response: Response, generation: int) -> None:
+        try:
+            payload = await response.json()
+        except Exception:
+            return  # Not JSON (or body already gone) - nothing usable
+        if generation == self._generation:
+            self._payloads.append(payload)
+
+    def reset(self) -> None:
+        """Forget everything captured so far (call before changing the filter)."""
+        self._generation += 1
+        self._payloads = []
+
+    async def drain(self, category_slug: Optional[str] = None) -> List[str]:
+        """Return the icons from responses captured since the last drain."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        payloads, self._payloads = self._payloads, []
+        icon_names: List[str] = []
+        for payload in payloads:
+            icon_names.extend(parse_search_payload(payload, category_slug))
+        return icon_names
+
+
+def host_allowed(url: str, allowed_hosts: tuple) -> bool:
+    """Check whether a request URL points at an allowlisted host (or a non-network URL)."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return True  # data:, blob: and friends never leave the browser
+    host = parts.hostname or ""
+    return any(host == allowed or host.endswith("." + allowed) for allowed in allowed_hosts)
+
+
+class ResourceBlocker:
+    """Context-wide route handler that aborts requests the scraper has no use for."""
+
+    def __init__(self, allowed_hosts: tuple):
+        self.allowed_hosts = allowed_hosts
+        self.blocked = 0
+
+    async def install(self, context: BrowserContext) -> None:
+        await context.route("**/*", self._handle)
+
+    async def install_on_page(self, context: BrowserContext, page: Page) -> None:
+        """
+        Cache-friendly variant for persistent profiles: block BLOCKED_URL_PATTERNS
+        through the DevTools protocol, which leaves the HTTP cache enabled.
+        Hosts are not filtered in this mode.
+        """
+        session = await context.new_cdp_session(page)
+        session.on("Network.loadingFailed", self._on_loading_failed)
+        await session.send("Network.enable")
+        await session.send("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+
+    def _on_loading_failed(self, event: Dict[str, Any]) -> None:
+        if event.get("blockedReason"):
+            self.blocked += 1
+
+    async def _handle(self, route: Route) -> None:
+        request = route.request
+        if (
+            request.resource_type in BLOCKED_RESOURCE_TYPES
+            or not host_allowed(request.url, self.allowed_hosts)
+        ):
+            self.blocked += 1
+            await route.abort()
+        else:
+            # Let a HAR replay route answer it if one is installed
+            await route.fallback()
+
+
+class CacheMeter:
+    """
+    Run-wide tally of how many responses came from the browser's HTTP cache
+    (memory or disk), per resource type, read from DevTools Network events.
+    """
+
+    def __init__(self):
+        self.by_type: Dict[str, Dict[str, int]] = {}
+        self.network_bytes = 0
+
+    async def watch(self, context: BrowserContext, page: Page) -> None:
+        session: CDPSession = await context.new_cdp_session(page)
+        served_from_cache: Set[str] = set()
+
+        def on_served(event: Dict[str, Any]) -> None:
+            served_from_cache.add(event["requestId"])
+
+        def on_response(event: Dict[str, Any]) -> None:
+            entry = self.by_type.setdefault(event.get("type", "Other"), {"requests": 0, "from_cache": 0})
+            entry["requests"] += 1
+            request_id = event["requestId"]
+            if request_id in served_from_cache or event["response"].get("fromDiskCache"):
+                entry["from_cache"] += 1
+            served_from_cache.discard(request_id)
+
+        def on_finished(event: Dict[str, Any]) -> None:
+            self.network_bytes += int(event.get("encodedDataLength", 0))
+
+        session.on("Network.requestServedFromCache", on_served)
+        session.on("Network.responseReceived", on_response)
+        session.on("Network.loadingFinished", on_finished)
+        await session.send("Network.enable")
+
+    def summary(self) -> Dict[str, Any]:
+        def rate(entry: Dict[str, int]) -> Optional[float]:
+            return round(entry["from_cache"] / entry["requests"], 3) if entry["requests"] else None
+
+        requests = sum(entry["requests"] for entry in self.by_type.values())
+        from_cache = sum(entry["from_cache"] for entry in self.by_type.values())
+        return {
+            "requests": requests,
+            "from_cache": from_cache,
+            "hit_rate": rate({"requests": requests, "from_cache": from_cache}),
+            "network_bytes": self.network_bytes,
+            "by_type": {
+                resource_type: {**entry, "hit_rate": rate(entry)}
+                for resource_type, entry in sorted(self.by_type.items())
+            },
+        }
+
+
+class TrafficMeter:
+    """Per-page tally of finished requests and the bytes they transferred."""
+
+    def __init__(self, page: Page):
+        self.requests = 0
+        self.bytes = 0
+        self._pending: Set[asyncio.Future] = set()
+        page.on("requestfinished", self._on_finished)
+
+    def _on_finished(self, request: Request) -> None:
+        self.requests += 1
+        task = asyncio.ensure_future(self._measure(request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _measure(self, request: Request) -> None:
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.bytes += sizes["responseHeadersSize"] + sizes["responseBodySize"]
+
+    async def settle(self) -> tuple:
+        """Wait for outstanding size lookups and return (requests, bytes) so far."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        return self.requests, self.bytes
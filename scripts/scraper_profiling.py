@@ -0,0 +1,149 @@
+"""
+Per-phase timing for the FontAwesome category scraper.
+
+A RunProfiler collects timed phases (navigate, click, grid_wait, extract,
+paginate, reset, sleep, ...) and retry counts per category. Code deep inside
+the scraper records into whichever profiler and category are active in the
+current asyncio task, via `profile_phase`, `profiled_sleep` and `count_retry`,
+so the page helpers don't need a profiler argument. Outside an active scope
+these helpers simply do nothing.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+RUN_SCOPE = "(run)"  # category label for work that isn't tied to one category
+SLEEP_PHASE = "sleep"
+
+
+@dataclass
+class PhaseEvent:
+    """One timed phase."""
+    category: str
+    phase: str
+    worker: int
+    start: float  # seconds since the profiler started
+    duration: float  # seconds
+
+
+class RunProfiler:
+    """Collects phase timings and retry counts for one scraping run."""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self.events: List[PhaseEvent] = []
+        self.retries: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.finished_at: Optional[float] = None
+
+    def now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def record(self, category: str, phase: str, worker: int, start: float, end: float) -> None:
+        self.events.append(PhaseEvent(category, phase, worker, start, end - start))
+
+    def finish(self) -> None:
+        self.finished_at = self.now()
+
+    @contextmanager
+    def scope(self, category: str = RUN_SCOPE, worker: int = 0) -> Iterator[None]:
+        """Attribute phases recorded in this task to `category` until the block ends."""
+        token = _ACTIVE_SCOPE.set((self, category, worker))
+        try:
+            yield
+        finally:
+            _ACTIVE_SCOPE.reset(token)
+
+    def summary(self, icons_per_category: Dict[str, int]) -> Dict:
+        """Summarize per-category and per-phase durations in milliseconds."""
+        wall = self.finished_at if self.finished_at is not None else self.now()
+        categories: Dict[str, Dict] = {}
+        phase_totals: Dict[str, float] = defaultdict(float)
+        for event in self.events:
+            entry = categories.setdefault(event.category, {"phases_ms": defaultdict(float)})
+            entry["phases_ms"][event.phase] += event.duration * 1000
+            phase_totals[event.phase] += event.duration * 1000
+
+        for category, entry in categories.items():
+            phases = entry["phases_ms"]
+            sleep_ms = phases.get(SLEEP_PHASE, 0.0)
+            work_ms = sum(ms for phase, ms in phases.items() if phase != SLEEP_PHASE)
+            icons = icons_per_category.get(category, 0)
+            entry.update({
+                "phases_ms": {phase: round(ms, 1) for phase, ms in sorted(phases.items())},
+                "sleep_ms": round(sleep_ms, 1),
+                "work_ms": round(work_ms, 1),
+                "retries": dict(self.retries.get(category, {})),
+                "icons": icons,
+                "icons_per_second": round(icons / ((sleep_ms + work_ms) / 1000), 1)
+                if sleep_ms + work_ms else None,
+            })
+
+        total_icons = sum(icons_per_category.values())
+        total_sleep = phase_totals.get(SLEEP_PHASE, 0.0)
+        return {
+            "wall_ms": round(wall * 1000, 1),
+            "sleep_ms": round(total_sleep, 1),
+            "work_ms": round(sum(phase_totals.values()) - total_sleep, 1),
+            "phases_ms": {phase: round(ms, 1) for phase, ms in sorted(phase_totals.items())},
+            "retries": sum(sum(counts.values()) for counts in self.retries.values()),
+            "icons": total_icons,
+            "icons_per_second": round(total_icons / wall, 1) if wall else None,
+            "categories": categories,
+        }
+
+    def trace_events(self) -> Dict:
+        """Export the phases in Chrome trace-event format (chrome://tracing, Perfetto)."""
+        return {
+            "traceEvents": [
+                {
+                    "name": event.phase,
+                    "cat": event.category,
+                    "ph": "X",
+                    "ts": round(event.start * 1_000_000),
+                    "dur": round(event.duration * 1_000_000),
+                    "pid": 1,
+                    "tid": event.worker,
+                    "args": {"category": event.category},
+                }
+                for event in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+
+# (profiler, category, worker) for the current asyncio task, if any
+_ACTIVE_SCOPE: ContextVar[Optional[tuple]] = ContextVar("scraper_profile_scope", default=None)
+
+
+@contextmanager
+def profile_phase(phase: str) -> Iterator[None]:
+    """Time the enclosed block as `phase` of the active category."""
+    scope = _ACTIVE_SCOPE.get()
+    if scope is None:
+        yield
+        return
+    profiler, category, worker = scope
+    start = profiler.now()
+    try:
+        yield
+    finally:
+        profiler.record(category, phase, worker, start, profiler.now())
+
+
+async def profiled_sleep(seconds: float) -> None:
+    """asyncio.sleep that is accounted as sleep time rather than work."""
+    with profile_phase(SLEEP_PHASE):
+        await asyncio.sleep(seconds)
+
+
+def count_retry(kind: str) -> None:
+    """Count a retry or fallback of the given kind against the active category."""
+    scope = _ACTIVE_SCOPE.get()
+    if scope is not None:
+        profiler, category, _ = scope
+        profiler.retries[category][kind] += 1
@@ -0,0 +1,203 @@
+"""
+Adaptive politeness for the FontAwesome category scraper.
+
+An AdaptiveRateController is shared by every worker page. It watches the
+responses those pages receive and scales the configured category and page
+delays by a single factor:
+
+- while responses come back quickly (under TARGET_RESPONSE_MS), the factor
+  shrinks towards MIN_DELAY_FACTOR, so a responsive site is scraped faster;
+- slow responses grow it gently;
+- HTTP 429/5xx responses and timeouts double it (up to MAX_DELAY_FACTOR) and
+  start an exponential cooldown (or the server's Retry-After) that every worker
+  waits out before its next request.
+
+Timeouts are noticed deep inside the page helpers, which report them with
+`report_timeout` to whichever controller is active in the current asyncio task,
+the same way scraper_profiling attributes phases.
+"""
+
+import asyncio
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from playwright.async_api import Page, Response
+
+from scraper_profiling import profiled_sleep
+
+TARGET_RESPONSE_MS = 1500  # responses faster than this count as healthy
+MIN_DELAY_FACTOR = 0.25  # never go below a quarter of the configured delays
+MAX_DELAY_FACTOR = 16.0
+HEALTHY_STREAK = 5  # healthy responses in a row before speeding up
+SPEED_UP = 0.8  # factor multiplier after a healthy streak
+SLOW_DOWN = 1.25  # factor multiplier after a slow response
+BACKOFF_BASE = 1.0  # seconds; first cooldown after a throttle or timeout
+BACKOFF_MAX = 60.0  # seconds
+# Only these requests say anything about how the site is coping
+MONITORED_RESOURCE_TYPES = ("document", "xhr", "fetch")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header given in seconds (HTTP dates are ignored)."""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+class AdaptiveRateController:
+    """
+    Shared rate controller. `wait_for_category` spaces out category starts and
+    `wait_for_page` page turns, each across all workers, so adding workers does
+    not raise either rate. Both delays are the configured ones scaled by
+    `factor`, and both wait out any cooldown.
+    """
+
+    def __init__(self, category_delay: float, page_delay: float):
+        self.category_delay = category_delay
+        self.page_delay = page_delay
+        self.factor = 1.0
+        self._latency_ms: Optional[float] = None  # moving average
+        self._healthy_streak = 0
+        self._failures = 0  # consecutive throttles/timeouts
+        self._cooldown_until = 0.0
+        self._next_category_slot = 0.0
+        self._next_page_slot = 0.0
+        self._lock = asyncio.Lock()
+        self._page_lock = asyncio.Lock()
+        self.stats: Dict[str, float] = {
+            "responses": 0,
+            "throttled": 0,
+            "server_errors": 0,
+            "timeouts": 0,
+            "speed_ups": 0,
+            "slow_downs": 0,
+            "backoffs": 0,
+            "cooldown_s": 0.0,
+            "min_factor": self.factor,
+            "max_factor": self.factor,
+        }
+
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_running_loop().time()
+
+    def _set_factor(self, factor: float) -> None:
+        self.factor = min(MAX_DELAY_FACTOR, max(MIN_DELAY_FACTOR, factor))
+        self.stats["min_factor"] = min(self.stats["min_factor"], self.factor)
+        self.stats["max_factor"] = max(self.stats["max_factor"], self.factor)
+
+    def observe(self, page: Page) -> None:
+        """Feed every monitored response the page receives into the controller."""
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Response) -> None:
+        request = response.request
+        if request.resource_type not in MONITORED_RESOURCE_TYPES:
+            return
+        self.stats["responses"] += 1
+        status = response.status
+        if status == 429 or status >= 500:
+            self.stats["throttled" if status == 429 else "server_errors"] += 1
+            self.record_failure(parse_retry_after(response.headers.get("retry-after")))
+        else:
+            latency = request.timing.get("responseStart", -1)
+            if latency >= 0:
+                self.record_latency(latency)
+
+    def record_latency(self, latency_ms: float) -> None:
+        """A successful response: speed up after a healthy streak, slow down if sluggish."""
+        self._failures = 0
+        if self._latency_ms is None:
+            self._latency_ms = latency_ms
+        else:
+            self._latency_ms = 0.8 * self._latency_ms + 0.2 * latency_ms
+
+        if self._latency_ms <= TARGET_RESPONSE_MS:
+            self._healthy_streak += 1
+            if self._healthy_streak >= HEALTHY_STREAK:
+                self._healthy_streak = 0
+                if self.factor > MIN_DELAY_FACTOR:
+                    self.stats["speed_ups"] += 1
+                self._set_factor(self.factor * SPEED_UP)
+        else:
+            self._healthy_streak = 0
+            self.stats["slow_downs"] += 1
+            self._set_factor(self.factor * SLOW_DOWN)
+
+    def record_timeout(self) -> None:
+        self.stats["timeouts"] += 1
+        self.record_failure()
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """A throttle, server error or timeout: double the delays and cool down."""
+        self._healthy_streak = 0
+        self._failures += 1
+        self.stats["backoffs"] += 1
+        self._set_factor(max(1.0, self.factor) * 2)
+        cooldown = retry_after if retry_after is not None else self.backoff_delay(self._failures)
+        self._cooldown_until = max(self._cooldown_until, self._now() + cooldown)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the `attempt`-th consecutive failure."""
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _sleep_until(self, deadline: float) -> None:
+        delay = deadline - self._now()
+        if delay > 0:
+            await profiled_sleep(delay)
+
+    async def wait_for_cooldown(self) -> None:
+        """Wait out any cooldown started by a throttle or timeout."""
+        cooldown = self._cooldown_until - self._now()
+        if cooldown > 0:
+            self.stats["cooldown_s"] += cooldown
+            await profiled_sleep(cooldown)
+
+    async def wait_for_category(self) -> None:
+        """Block until the caller is allowed to start the next category."""
+        async with self._lock:
+            await self.wait_for_cooldown()
+            await self._sleep_until(self._next_category_slot)
+            self._next_category_slot = self._now() + self.category_delay * self.factor
+
+    async def wait_for_page(self) -> None:
+        """
+        Block until the caller is allowed to turn a page. Time since the last
+        page turn (spent waiting for the grid) already counts towards the delay.
+        """
+        async with self._page_lock:
+            await self.wait_for_cooldown()
+            await self._sleep_until(self._next_page_slot)
+            self._next_page_slot = self._now() + self.page_delay * self.factor
+
+    @contextmanager
+    def active(self) -> Iterator[None]:
+        """Make this controller the one `report_timeout` reports to in this task."""
+        token = _ACTIVE_CONTROLLER.set(self)
+        try:
+            yield
+        finally:
+            _ACTIVE_CONTROLLER.reset(token)
+
+    def summary(self) -> Dict:
+        return {
+            **{key: round(value, 2) for key, value in self.stats.items()},
+            "final_factor": round(self.factor, 2),
+            "mean_latency_ms": round(self._latency_ms, 1) if self._latency_ms is not None else None,
+        }
+
+
+_ACTIVE_CONTROLLER: ContextVar[Optional[AdaptiveRateController]] = ContextVar(
+    "scraper_rate_controller", default=None
+)
+
+
+def report_timeout() -> None:
+    """Tell the active controller (if any) that a wait timed out."""
+    controller = _ACTIVE_CONTROLLER.get()
+    if controller is not None:
+        controller.record_timeout()
@@ -0,0 +1,107 @@
+"""
+Sharded runs for the FontAwesome category scraper.
+
+`--shard i/N` scrapes only shard i of N. Each shard writes a partial output
+(its categories plus the full sidebar list), and `--merge` combines the
+partial outputs into the canonical one. Nothing here touches the browser.
+
+Categories are dealt round-robin over their sorted names, so every process
+and host that sees the same sidebar agrees on the split, whatever order the
+sidebar lists them in, and shard sizes differ by at most one category.
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def parse_shard_spec(spec: str) -> tuple:
+    """Parse a shard spec "i/N" (1 <= i <= N) into (i, N)."""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec)
+    if not match:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {spec!r}")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+
+def assign_shards(category_names: Iterable[str], count: int) -> Dict[str, int]:
+    """Category name -> 1-based shard out of `count`, dealt round-robin over the sorted names."""
+    return {
+        category_name: position % count + 1
+        for position, category_name in enumerate(sorted(set(category_names)))
+    }
+
+
+def shard_file(path: Path, shard: Optional[tuple]) -> Path:
+    """Per-shard variant of an output path: name.ext -> name.shard-i-of-N.ext."""
+    if not shard:
+        return path
+    base, _, suffixes = path.name.partition(".")
+    return path.with_name(f"{base}.shard-{shard[0]}-of-{shard[1]}.{suffixes}")
+
+
+def merge_partial_results(paths: List[Path]) -> tuple:
+    """
+    Combine shard outputs into (categories, signals, partial categories) in
+    sidebar order.
+    Raises ValueError listing every problem: shards missing from or repeated
+    in the set, categories scraped by more than one shard, and sidebar
+    categories that no shard delivered.
+    """
+    partials = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            partials.append((path, json.load(f)))
+    if not partials:
+        raise ValueError("no shard outputs to merge")
+
+    problems: List[str] = []
+    counts = {partial["shard"]["count"] for _, partial in partials}
+    if len(counts) > 1:
+        problems.append(f"shard outputs disagree on the shard count: {sorted(counts)}")
+    seen_shards: Dict[int, Path] = {}
+    unique_partials = []
+    for path, partial in partials:
+        index = partial["shard"]["index"]
+        if index in seen_shards:
+            problems.append(f"shard {index} appears twice: {seen_shards[index].name}, {path.name}")
+            continue
+        seen_shards[index] = path
+        unique_partials.append((path, partial))
+    for index in range(1, max(counts) + 1):
+        if index not in seen_shards:
+            problems.append(f"shard {index}/{max(counts)} is missing")
+
+    # Sidebar order from the first shard, plus anything only other shards saw
+    order: List[str] = []
+    for _, partial in partials:
+        order.extend(name for name in partial["all_categories"] if name not in order)
+
+    merged: Dict[str, List[str]] = {}
+    signals: Dict[str, int] = {}
+    partial_categories: Set[str] = set()
+    owners: Dict[str, Path] = {}
+    for path, partial in unique_partials:
+        for category_name, icons in partial["categories"].items():
+            if category_name in owners:
+                problems.append(
+                    f"category '{category_name}' is in both {owners[category_name].name} and {path.name}"
+                )
+                continue
+            owners[category_name] = path
+            merged[category_name] = icons
+        signals.update(partial.get("category_signals", {}))
+        partial_categories.update(partial.get("partial_categories", []))
+    missing = [name for name in order if name not in merged]
+    if missing:
+        problems.append(f"{len(missing)} categories were not scraped by any shard: {', '.join(missing)}")
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    ordered = {name: merged[name] for name in order}
+    ordered.update((name, icons) for name, icons in merged.items() if name not in ordered)
+    return ordered, signals, [name for name in ordered if name in partial_categories]
@@ -0,0 +1,78 @@
+"""Tests for style folding and the compact catalog."""
+
+from fontawesome_catalog import (
+    STYLE_PREFIXES,
+    build_compact_catalog,
+    build_style_table,
+    expand_compact_catalog,
+    expand_icon_records,
+    fold_icons,
+    split_icon_class,
+)
+
+CATEGORIES = {
+    "alert": [
+        "fa-classic fa-solid fa-bell",
+        "fa-classic fa-regular fa-bell",
+        "fa-classic fa-solid fa-triangle-exclamation",
+    ],
+    "time": [
+        "fa-classic fa-solid fa-bell",
+        "fa-classic fa-solid fa-clock",
+        "fa-classic fa-regular fa-clock",
+    ],
+}
+
+
+def test_split_icon_class():
+    assert split_icon_class(" fa-classic fa-solid fa-house ") == ("fa-classic fa-solid", "house")
+    assert split_icon_class("fa-brands fa-github") == ("fa-brands", "github")
+
+
+def test_style_table_appends_unknown_prefixes_without_mutating_the_base():
+    base = tuple(STYLE_PREFIXES)
+    styles = build_style_table(["fa-custom fa-new fa-x", "fa-classic fa-solid fa-y", "fa-custom fa-new fa-z"])
+    assert styles == list(base) + ["fa-custom fa-new"]
+    assert STYLE_PREFIXES == base
+
+
+def test_fold_and_expand_round_trip():
+    class_strings = CATEGORIES["alert"] + ["fa-classic fa-solid fa-bell"]
+    records = fold_icons(class_strings, STYLE_PREFIXES)
+    assert [name for name, _ in records] == ["bell", "triangle-exclamation"]
+    assert sorted(expand_icon_records(records)) == sorted(set(class_strings))
+
+
+def test_fold_builds_its_own_table_for_unknown_styles():
+    class_strings = ["fa-custom fa-new fa-x"]
+    records = fold_icons(class_strings)
+    assert expand_icon_records(records, build_style_table(class_strings)) == class_strings
+
+
+def test_compact_catalog_round_trip():
+    compact = build_compact_catalog(CATEGORIES, {"total_icons": 6})
+    assert [name for name, _ in compact["icons"]] == ["bell", "triangle-exclamation", "clock"]
+    assert compact["metadata"]["unique_icons"] == 3
+    assert compact["metadata"]["total_icon_records"] == 4
+    expanded = expand_compact_catalog(compact)
+    assert {name: sorted(icons) for name, icons in expanded.items()} == {
+        name: sorted(icons) for name, icons in CATEGORIES.items()
+    }
+
+
+def test_compact_catalog_keeps_per_category_style_subsets():
+    compact = build_compact_catalog(CATEGORIES, {})
+    bell = compact["icons"][0]
+    # "time" only has the solid bell, so it carries its own mask
+    assert compact["category_icons"][1][0] == [0, 1 << compact["styles"].index("fa-classic fa-solid")]
+    assert compact["category_icons"][0][0] == 0
+    assert bell[1] != compact["category_icons"][1][0][1]
+    assert compact["icon_categories"][0] == [0, 1]
+
+
+def test_expand_compact_catalog_filters_by_style():
+    compact = build_compact_catalog(CATEGORIES, {})
+    assert expand_compact_catalog(compact, "fa-classic fa-regular") == {
+        "alert": ["fa-classic fa-regular fa-bell"],
+        "time": ["fa-classic fa-regular fa-clock"],
+    }
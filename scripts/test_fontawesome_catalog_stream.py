@@ -0,0 +1,182 @@
+"""Tests for the streaming catalog reader, writer and validator."""
+
+import json
+
+import pytest
+
+from fontawesome_catalog import dump_json
+from fontawesome_catalog_stream import (
+    CatalogFormatError,
+    CatalogStreamReader,
+    catalogs_equal,
+    iter_categories,
+    validate_catalog,
+    write_catalog,
+)
+
+CATEGORIES = {
+    "accessibility": ["fa-classic fa-solid fa-universal-access", "fa-classic fa-regular fa-eye"],
+    "alert": ["fa-classic fa-solid fa-bell", "fa-classic fa-regular fa-bell"],
+    "émoji \"quoted\"": ["fa-classic fa-solid fa-face-smile"],
+    "empty": [],
+}
+METADATA = {
+    "scrape_date": "2026-01-01T00:00:00",
+    "total_categories": 4,
+    "total_icons": 5,
+    "total_icon_records": 4,
+}
+
+
+def write_json(path, data, minify=False):
+    path.write_text(dump_json(data, minify), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    return write_json(tmp_path / "catalog.json", {"metadata": METADATA, "categories": CATEGORIES})
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+@pytest.mark.parametrize("minify", [False, True])
+def test_reader_matches_json_load_at_any_chunk_size(tmp_path, chunk_size, minify):
+    path = write_json(
+        tmp_path / "catalog.json",
+        {"metadata": METADATA, "categories": CATEGORIES, "extra": [1, 2.5, None]},
+        minify,
+    )
+    with CatalogStreamReader(path, chunk_size) as reader:
+        categories = dict(reader.categories())
+        assert reader.metadata == METADATA
+        assert reader.extra == {"extra": [1, 2.5, None]}
+    assert categories == CATEGORIES
+
+
+def test_reader_does_not_cut_a_number_at_the_buffer_end(tmp_path):
+    # "12345" straddles every chunk boundary of size 1..5
+    path = tmp_path / "catalog.json"
+    path.write_text('{"metadata":{"total_icons":12345},"categories":{}}', encoding="utf-8")
+    for chunk_size in range(1, 6):
+        with CatalogStreamReader(path, chunk_size) as reader:
+            list(reader.categories())
+            assert reader.metadata == {"total_icons": 12345}
+
+
+def test_reader_handles_categories_before_metadata(tmp_path):
+    path = write_json(tmp_path / "catalog.json", {"categories": CATEGORIES, "metadata": METADATA})
+    with CatalogStreamReader(path, 3) as reader:
+        assert dict(reader.categories()) == CATEGORIES
+        assert reader.metadata == METADATA
+
+
+@pytest.mark.parametrize("body", [
+    '{"metadata": {}, "categories": {"a": ["x"',
+    '{"metadata": {}, "categories": {"a" ["x"]}}',
+    '["not", "an", "object"]',
+    '{"metadata": {}} trailing',
+])
+def test_reader_rejects_malformed_input(tmp_path, body):
+    path = tmp_path / "catalog.json"
+    path.write_text(body, encoding="utf-8")
+    with pytest.raises(CatalogFormatError):
+        list(iter_categories(path, chunk_size=4))
+
+
+def test_error_message_does_not_repeat_at(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text('{"metadata": {}, "categories": {"a": ["unterminated', encoding="utf-8")
+    with pytest.raises(CatalogFormatError) as error:
+        list(iter_categories(path))
+    assert "at at" not in str(error.value)
+    assert "Unterminated string starting at offset" in str(error.value)
+
+
+def test_validator_accepts_a_consistent_catalog(catalog_path):
+    summary = validate_catalog(catalog_path, chunk_size=5)
+    assert summary.valid, summary.errors
+    assert summary.category_counts == {name: len(icons) for name, icons in CATEGORIES.items()}
+    assert summary.total_icons == 5
+    assert summary.total_icon_records == 4
+
+
+def test_validator_checks_totals_against_the_data(tmp_path):
+    metadata = {**METADATA, "total_categories": 5, "total_icons": 6}
+    path = write_json(tmp_path / "catalog.json", {"metadata": metadata, "categories": CATEGORIES})
+    errors = validate_catalog(path).errors
+    assert "metadata total_categories is 5 but the catalog has 4" in errors
+    assert "metadata total_icons is 6 but the catalog has 5" in errors
+
+
+def test_validator_reports_duplicates_and_bad_class_strings(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text(
+        '{"metadata": {"total_categories": 1, "total_icons": 3},'
+        ' "categories": {"a": ["fa-classic fa-solid fa-x"], "a": ["nospace", 7]}}',
+        encoding="utf-8",
+    )
+    errors = validate_catalog(path).errors
+    assert "category 'a' appears more than once" in errors
+    assert any("invalid class string 'nospace'" in error for error in errors)
+    assert any("invalid class string 7" in error for error in errors)
+
+
+def test_validator_reports_truncation_and_missing_metadata(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text('{"categories": {"a": ["fa-classic fa-solid fa-x"]', encoding="utf-8")
+    summary = validate_catalog(path)
+    assert not summary.valid
+    assert "catalog has no metadata" in summary.errors
+
+
+def test_validator_collects_the_style_table(tmp_path):
+    categories = {"a": ["fa-classic fa-solid fa-x", "fa-custom fa-new fa-x"]}
+    metadata = {"total_categories": 1, "total_icons": 2}
+    path = write_json(tmp_path / "catalog.json", {"metadata": metadata, "categories": categories})
+    assert validate_catalog(path).styles[-1] == "fa-custom fa-new"
+
+
+@pytest.mark.parametrize("minify", [False, True])
+@pytest.mark.parametrize("categories", [CATEGORIES, {}])
+def test_writer_output_is_byte_identical_to_dump_json(tmp_path, minify, categories):
+    path = tmp_path / "catalog.json"
+    assert write_catalog(path, METADATA, categories.items(), minify)
+    expected = dump_json({"metadata": METADATA, "categories": categories}, minify)
+    assert path.read_text(encoding="utf-8") == expected
+
+
+def test_writer_skips_unchanged_content_ignoring_scrape_date(catalog_path):
+    before = catalog_path.stat().st_mtime_ns
+    metadata = {**METADATA, "scrape_date": "2030-01-01T00:00:00"}
+    assert not write_catalog(catalog_path, metadata, CATEGORIES.items())
+    assert catalog_path.stat().st_mtime_ns == before
+    assert json.loads(catalog_path.read_text(encoding="utf-8"))["metadata"] == METADATA
+
+
+def test_writer_rewrites_changed_content_and_layout(catalog_path):
+    changed = {**CATEGORIES, "alert": ["fa-classic fa-solid fa-bell"]}
+    assert write_catalog(catalog_path, METADATA, changed.items())
+    assert dict(iter_categories(catalog_path)) == changed
+    assert write_catalog(catalog_path, METADATA, changed.items(), minify=True)
+    assert not catalog_path.read_text(encoding="utf-8").startswith("{\n")
+
+
+def test_writer_leaves_the_target_alone_on_error(catalog_path):
+    original = catalog_path.read_bytes()
+
+    def failing():
+        yield "accessibility", CATEGORIES["accessibility"]
+        raise RuntimeError("scrape failed")
+
+    with pytest.raises(RuntimeError):
+        write_catalog(catalog_path, METADATA, failing())
+    assert catalog_path.read_bytes() == original
+    assert [p.name for p in catalog_path.parent.iterdir()] == [catalog_path.name]
+
+
+def test_catalogs_equal_compares_content(tmp_path, catalog_path):
+    same = write_json(tmp_path / "same.json", {"metadata": METADATA, "categories": CATEGORIES})
+    other = write_json(tmp_path / "other.json", {"metadata": METADATA, "categories": {"alert": []}})
+    assert catalogs_equal(catalog_path, same)
+    assert not catalogs_equal(catalog_path, other)
+    assert not catalogs_equal(catalog_path, tmp_path / "missing.json")
@@ -0,0 +1,74 @@
+"""Tests for the prebuilt icon search index."""
+
+import pytest
+
+from fontawesome_catalog import build_compact_catalog
+from fontawesome_search_index import IconSearchIndex, build_search_index, delta_decode, delta_encode
+
+CATEGORIES = {
+    "arrows": [
+        "fa-classic fa-solid fa-arrow-up",
+        "fa-classic fa-solid fa-arrow-down",
+        "fa-classic fa-solid fa-arrows-rotate",
+        "fa-classic fa-regular fa-circle-up",
+    ],
+    "household": [
+        "fa-classic fa-solid fa-house",
+        "fa-classic fa-regular fa-house",
+        "fa-classic fa-solid fa-house-chimney",
+        "fa-classic fa-solid fa-lighthouse",
+    ],
+}
+
+
+@pytest.fixture
+def compact():
+    return build_compact_catalog(CATEGORIES, {})
+
+
+@pytest.fixture
+def search(compact):
+    return IconSearchIndex(build_search_index(compact), compact)
+
+
+def test_delta_round_trip():
+    ids = [0, 3, 4, 10, 250]
+    assert delta_encode(ids) == [0, 3, 1, 6, 240]
+    assert delta_decode(delta_encode(ids)) == ids
+    assert delta_decode(delta_encode([])) == []
+
+
+def test_exact_name_ranks_before_prefix_and_substring(search):
+    assert [hit.name for hit in search.search("house")] == ["house", "house-chimney", "lighthouse"]
+
+
+def test_every_query_word_must_match(search):
+    # circle-up matches "arrow" through its category only, so it ranks lower
+    assert [hit.name for hit in search.search("arrow up")] == ["arrow-up", "circle-up"]
+    assert search.search("house arrow") == []
+    assert search.search("   ") == []
+
+
+def test_category_words_match_member_icons(search):
+    names = {hit.name for hit in search.search("household")}
+    assert names == {"house", "house-chimney", "lighthouse"}
+    assert search.search("house")[0].categories == ["household"]
+
+
+def test_style_filter_and_limit(search):
+    assert [hit.name for hit in search.search("house", style="fa-classic fa-regular")] == ["house"]
+    assert len(search.search("arrow", limit=1)) == 1
+
+
+def test_search_categories(search):
+    assert search.search_categories("house") == ["household"]
+    assert search.search_categories("") == []
+
+
+def test_index_must_match_the_catalog(compact):
+    index = build_search_index(compact)
+    other = build_compact_catalog({"arrows": CATEGORIES["arrows"]}, {})
+    with pytest.raises(ValueError, match="different compact catalog"):
+        IconSearchIndex(index, other)
+    with pytest.raises(ValueError, match="unsupported search index version"):
+        IconSearchIndex({**index, "version": 0}, compact)
@@ -0,0 +1,91 @@
+"""Tests for the scraper's browser-free incremental-refresh logic."""
+
+import json
+
+import pytest
+
+import scrape_fontawesome_categories as scraper
+from scrape_fontawesome_categories import (
+    ScrapeResult,
+    build_change_report,
+    find_unchanged_categories,
+    load_previous_run,
+    signals_to_save,
+)
+
+PREVIOUS = {
+    "alert": ["fa-classic fa-solid fa-bell", "fa-classic fa-regular fa-bell"],
+    "time": ["fa-classic fa-solid fa-clock"],
+}
+
+
+@pytest.fixture
+def saved_run(tmp_path, monkeypatch):
+    """Point the scraper's output files at tmp_path; returns (catalog, metadata) paths."""
+    catalog = tmp_path / "fontawesome_icon_categories.json"
+    metadata = tmp_path / "fontawesome_categories_metadata.json"
+    monkeypatch.setattr(scraper, "OUTPUT_FILE", catalog)
+    monkeypatch.setattr(scraper, "CATEGORIES_METADATA_FILE", metadata)
+    catalog.write_text(json.dumps({"metadata": {}, "categories": PREVIOUS}), encoding="utf-8")
+    return catalog, metadata
+
+
+def test_load_previous_run_uses_stored_signals(saved_run):
+    _, metadata = saved_run
+    metadata.write_text(json.dumps({"category_signals": {"alert": 7}}), encoding="utf-8")
+    assert load_previous_run() == (PREVIOUS, {"alert": 7})
+
+
+def test_load_previous_run_falls_back_to_base_icon_counts(saved_run):
+    _, metadata = saved_run
+    metadata.write_text(json.dumps({"category_counts": {"alert": 2, "time": 1}}), encoding="utf-8")
+    # The sidebar counts base icons, so alert's two styles of one icon count once
+    assert load_previous_run() == (PREVIOUS, {"alert": 1, "time": 1})
+
+
+def test_load_previous_run_without_a_catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, "OUTPUT_FILE", tmp_path / "missing.json")
+    monkeypatch.setattr(scraper, "CATEGORIES_METADATA_FILE", tmp_path / "missing-metadata.json")
+    assert load_previous_run() == ({}, {})
+
+
+def test_find_unchanged_categories():
+    stored = {"alert": 1, "time": 1, "zoo": 3}
+    live = {"alert": 1, "time": 2, "new": 4}
+    unchanged = find_unchanged_categories(["alert", "time", "zoo", "new"], PREVIOUS, stored, live)
+    # time changed, zoo has no live count, new has no previous icons
+    assert unchanged == {"alert": PREVIOUS["alert"]}
+
+
+def test_find_unchanged_categories_needs_a_stored_signal():
+    assert find_unchanged_categories(["alert"], PREVIOUS, {}, {"alert": 1}) == {}
+
+
+def test_change_report_lists_added_and_removed_icons():
+    current = {
+        "alert": ["fa-classic fa-solid fa-bell", "fa-classic fa-solid fa-siren"],
+        "time": PREVIOUS["time"],
+        "new": [],
+    }
+    report = build_change_report(PREVIOUS, current, ["alert", "time"])
+    assert report["changes"] == {
+        "alert": {"added": ["fa-classic fa-solid fa-siren"], "removed": ["fa-classic fa-regular fa-bell"]},
+    }
+    assert report["added_categories"] == ["new"]
+    assert report["removed_categories"] == []
+
+
+def test_change_report_does_not_list_icons_of_a_missing_category():
+    report = build_change_report(PREVIOUS, {"time": PREVIOUS["time"]}, ["alert"])
+    assert report["changes"] == {}
+    assert report["removed_categories"] == ["alert"]
+
+
+def test_signals_to_save_leaves_out_categories_that_need_another_scrape():
+    result = ScrapeResult(
+        category_signals={"alert": 1, "time": 2, "zoo": 3, "maps": 4},
+        stale_categories=["time"],
+        partial_categories=["zoo"],
+        count_mismatches={"maps": {"sidebar": 4, "scraped": 3}},
+    )
+    assert signals_to_save(result) == {"alert": 1}
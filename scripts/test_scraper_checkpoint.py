@@ -0,0 +1,52 @@
+"""Tests for the scraper's checkpoint journal."""
+
+from scraper_checkpoint import CheckpointJournal
+
+
+def test_journal_round_trip(tmp_path):
+    journal = CheckpointJournal(tmp_path / "run.checkpoint.jsonl")
+    assert journal.load() == {}
+    journal.record("cat-1", "alert", ["fa-classic fa-solid fa-bell"])
+    journal.record("cat-2", "time", [])
+    assert journal.load() == {"alert": ["fa-classic fa-solid fa-bell"], "time": []}
+
+
+def test_journal_ignores_a_torn_last_line(tmp_path):
+    path = tmp_path / "run.checkpoint.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record("cat-1", "alert", ["fa-classic fa-solid fa-bell"])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"category": "time", "icons": ["fa-cla')
+    assert journal.load() == {"alert": ["fa-classic fa-solid fa-bell"]}
+    assert path.read_text(encoding="utf-8").endswith("\n")
+
+
+def test_journal_appends_cleanly_after_a_torn_line(tmp_path):
+    path = tmp_path / "run.checkpoint.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record("cat-1", "alert", [])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"category": "time", "icons": ["fa-cla')
+    # A resumed run loads the journal, then records the categories it redoes
+    journal.load()
+    journal.record("cat-2", "time", ["fa-classic fa-solid fa-clock"])
+    journal.record("cat-3", "zoo", [])
+    assert journal.load() == {"alert": [], "time": ["fa-classic fa-solid fa-clock"], "zoo": []}
+
+
+def test_journal_keeps_an_entry_missing_only_its_newline(tmp_path):
+    path = tmp_path / "run.checkpoint.jsonl"
+    journal = CheckpointJournal(path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"category": "alert", "icons": []}')
+    assert journal.load() == {"alert": []}
+    journal.record("cat-2", "time", [])
+    assert journal.load() == {"alert": [], "time": []}
+
+
+def test_journal_reset(tmp_path):
+    journal = CheckpointJournal(tmp_path / "run.checkpoint.jsonl")
+    journal.reset()
+    journal.record("cat-1", "alert", [])
+    journal.reset()
+    assert journal.load() == {}
@@ -0,0 +1,49 @@
+"""Tests for parsing icons out of search API payloads."""
+
+from fontawesome_fixture_server import FixtureSite, generate_catalog
+from scraper_network import parse_search_payload
+
+
+def test_payload_from_the_fixture_matches_the_grid():
+    site = FixtureSite(catalog=generate_catalog(3, 25), page_size=10)
+    expected = site.expected_categories()
+    for category, class_strings in expected.items():
+        harvested = []
+        for page in range(1, 4):
+            harvested.extend(parse_search_payload(site.search(category, page), category))
+        assert harvested == class_strings
+
+
+def test_hits_for_other_categories_are_dropped():
+    payload = {"hits": [
+        {"id": "bell", "membership": {"free": ["solid"]}, "categories": ["alert"]},
+        {"id": "clock", "membership": {"free": ["solid"]}, "categories": ["time"]},
+        {"id": "house", "membership": {"free": ["regular"]}, "categories": []},
+    ]}
+    assert parse_search_payload(payload, "alert") == [
+        "fa-classic fa-solid fa-bell",
+        "fa-classic fa-regular fa-house",
+    ]
+    assert len(parse_search_payload(payload)) == 3
+
+
+def test_family_styles_keep_only_free_classic_ones():
+    payload = {"results": [{"hits": [{
+        "name": "star",
+        "familyStylesByLicense": {
+            "free": [
+                {"family": "classic", "style": "solid"},
+                {"family": "sharp", "style": "solid"},
+                {"style": "regular"},
+            ],
+            "pro": [{"family": "classic", "style": "light"}],
+        },
+    }]}]}
+    assert parse_search_payload(payload) == ["fa-classic fa-solid fa-star", "fa-classic fa-regular fa-star"]
+
+
+def test_plain_styles_and_non_icon_payloads():
+    assert parse_search_payload({"data": {"id": "x", "styles": ["brands"]}}) == ["fa-classic fa-brands fa-x"]
+    assert parse_search_payload({"page": 1, "nbPages": 3, "query": "bell"}) == []
+    assert parse_search_payload([None, "text", 3]) == []
+
@@ -0,0 +1,149 @@
+"""Tests for the adaptive rate controller's factor, backoff and cooldown logic."""
+
+import asyncio
+
+import pytest
+
+import scraper_rate_control
+from scraper_rate_control import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    HEALTHY_STREAK,
+    MAX_DELAY_FACTOR,
+    MIN_DELAY_FACTOR,
+    SLOW_DOWN,
+    SPEED_UP,
+    TARGET_RESPONSE_MS,
+    AdaptiveRateController,
+    parse_retry_after,
+    report_timeout,
+)
+
+
+class FakeClock:
+    """Stands in for the event loop clock and asyncio.sleep, so waits take no real time."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(AdaptiveRateController, "_now", staticmethod(lambda: clock.now))
+    monkeypatch.setattr(scraper_rate_control, "profiled_sleep", clock.sleep)
+    return clock
+
+
+@pytest.fixture
+def rate(clock):
+    return AdaptiveRateController(category_delay=1.0, page_delay=0.5)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-2") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+def test_healthy_streak_speeds_up_down_to_the_minimum(rate):
+    for _ in range(HEALTHY_STREAK - 1):
+        rate.record_latency(TARGET_RESPONSE_MS / 2)
+    assert rate.factor == 1.0
+    rate.record_latency(TARGET_RESPONSE_MS / 2)
+    assert rate.factor == pytest.approx(SPEED_UP)
+    for _ in range(HEALTHY_STREAK * 50):
+        rate.record_latency(TARGET_RESPONSE_MS / 2)
+    assert rate.factor == MIN_DELAY_FACTOR
+    assert rate.summary()["min_factor"] == MIN_DELAY_FACTOR
+
+
+def test_slow_responses_slow_down(rate):
+    rate.record_latency(TARGET_RESPONSE_MS * 3)
+    assert rate.factor == pytest.approx(SLOW_DOWN)
+    assert rate.stats["slow_downs"] == 1
+
+
+def test_failures_double_the_factor_up_to_the_maximum(rate):
+    rate.record_failure(retry_after=0)
+    assert rate.factor == 2.0
+    for _ in range(10):
+        rate.record_failure(retry_after=0)
+    assert rate.factor == MAX_DELAY_FACTOR
+    assert rate.stats["backoffs"] == 11
+
+
+def test_failure_after_speeding_up_doubles_from_one(rate):
+    rate.factor = MIN_DELAY_FACTOR
+    rate.record_failure(retry_after=0)
+    assert rate.factor == 2.0
+
+
+def test_backoff_delay_is_exponential_with_jitter(rate, monkeypatch):
+    monkeypatch.setattr(scraper_rate_control.random, "uniform", lambda low, high: high)
+    assert [rate.backoff_delay(attempt) for attempt in (1, 2, 3)] == [
+        BACKOFF_BASE, BACKOFF_BASE * 2, BACKOFF_BASE * 4,
+    ]
+    assert rate.backoff_delay(50) == BACKOFF_MAX
+    monkeypatch.setattr(scraper_rate_control.random, "uniform", lambda low, high: low)
+    assert rate.backoff_delay(2) == BACKOFF_BASE
+
+
+def test_retry_after_sets_the_cooldown(rate, clock):
+    rate.record_failure(retry_after=7)
+    asyncio.run(rate.wait_for_cooldown())
+    assert clock.sleeps == [7]
+    assert rate.stats["cooldown_s"] == 7
+
+
+def test_success_resets_the_consecutive_failures(rate, monkeypatch):
+    attempts = []
+    monkeypatch.setattr(rate, "backoff_delay", lambda attempt: attempts.append(attempt) or 0)
+    rate.record_failure()
+    rate.record_failure()
+    rate.record_latency(10)
+    rate.record_failure()
+    assert attempts == [1, 2, 1]
+
+
+def test_category_starts_are_spaced_by_the_scaled_delay(rate, clock):
+    async def start_three():
+        for _ in range(3):
+            await rate.wait_for_category()
+
+    rate.factor = 2.0
+    asyncio.run(start_three())
+    assert clock.sleeps == [2.0, 2.0]
+
+
+def test_page_turns_share_one_slot_across_workers(rate, clock):
+    async def turn_pages(workers):
+        await asyncio.gather(*(rate.wait_for_page() for _ in range(workers)))
+
+    # Four workers turning a page at once are spaced like one worker turning four
+    asyncio.run(turn_pages(4))
+    assert clock.sleeps == [0.5, 0.5, 0.5]
+
+
+def test_page_slot_counts_the_time_already_spent(rate, clock):
+    asyncio.run(rate.wait_for_page())
+    clock.now += 0.2
+    asyncio.run(rate.wait_for_page())
+    clock.now += 1.0
+    asyncio.run(rate.wait_for_page())
+    assert clock.sleeps == [pytest.approx(0.3)]
+
+
+def test_report_timeout_goes_to_the_active_controller(rate):
+    report_timeout()
+    assert rate.stats["timeouts"] == 0
+    with rate.active():
+        report_timeout()
+    assert rate.stats["timeouts"] == 1
+    assert rate.factor == 2.0
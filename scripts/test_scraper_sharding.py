@@ -0,0 +1,117 @@
+"""Tests for shard assignment and merging of shard outputs."""
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from scraper_sharding import assign_shards, merge_partial_results, parse_shard_spec, shard_file
+
+SIDEBAR = [f"category-{n:02d}" for n in range(10)]
+
+
+def test_parse_shard_spec():
+    assert parse_shard_spec("2/3") == (2, 3)
+    assert parse_shard_spec(" 1 / 1 ") == (1, 1)
+    for spec in ("0/3", "4/3", "3", "a/b", "1/0"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard_spec(spec)
+
+
+@pytest.mark.parametrize("count", [1, 3, 8, 10, 24])
+def test_assign_shards_is_balanced(count):
+    shards = assign_shards(SIDEBAR, count)
+    sizes = Counter(shards.values())
+    assert set(shards) == set(SIDEBAR)
+    assert all(1 <= shard <= count for shard in shards.values())
+    assert max(sizes.values()) - min(sizes.get(index, 0) for index in range(1, count + 1)) <= 1
+
+
+def test_assign_shards_ignores_sidebar_order():
+    assert assign_shards(SIDEBAR, 3) == assign_shards(reversed(SIDEBAR), 3)
+
+
+def test_shard_file():
+    path = Path("out/fontawesome_icon_categories.checkpoint.jsonl")
+    assert shard_file(path, None) == path
+    assert shard_file(path, (2, 3)).name == "fontawesome_icon_categories.shard-2-of-3.checkpoint.jsonl"
+
+
+def write_partials(tmp_path, count, sidebar=SIDEBAR, categories=None, partial=()):
+    """Write one partial output per shard, as save_partial_results would."""
+    categories = categories or {name: [f"fa-classic fa-solid fa-{name}"] for name in sidebar}
+    shards = assign_shards(sidebar, count)
+    paths = []
+    for index in range(1, count + 1):
+        path = tmp_path / f"partial.shard-{index}-of-{count}.json"
+        path.write_text(json.dumps({
+            "shard": {"index": index, "count": count},
+            "all_categories": sidebar,
+            "partial_categories": [name for name in partial if shards.get(name) == index],
+            "category_signals": {name: 1 for name in categories if shards.get(name) == index},
+            "categories": {name: icons for name, icons in categories.items() if shards.get(name) == index},
+        }), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_merge_restores_sidebar_order(tmp_path):
+    merged, signals, partial = merge_partial_results(write_partials(tmp_path, 3))
+    assert list(merged) == SIDEBAR
+    assert signals == {name: 1 for name in SIDEBAR}
+    assert partial == []
+
+
+def test_merge_keeps_track_of_partial_categories(tmp_path):
+    paths = write_partials(tmp_path, 3, partial=[SIDEBAR[7], SIDEBAR[2]])
+    assert merge_partial_results(paths)[2] == [SIDEBAR[2], SIDEBAR[7]]
+
+
+def test_merge_accepts_empty_shards(tmp_path):
+    merged, _, _ = merge_partial_results(write_partials(tmp_path, 12))
+    assert list(merged) == SIDEBAR
+
+
+def test_merge_reports_a_missing_shard(tmp_path):
+    paths = write_partials(tmp_path, 3)
+    with pytest.raises(ValueError, match="shard 2/3 is missing"):
+        merge_partial_results([paths[0], paths[2]])
+
+
+def test_merge_reports_a_repeated_shard(tmp_path):
+    paths = write_partials(tmp_path, 3)
+    copy = tmp_path / "copy.json"
+    copy.write_text(paths[0].read_text(encoding="utf-8"), encoding="utf-8")
+    with pytest.raises(ValueError) as error:
+        merge_partial_results(paths + [copy])
+    assert "shard 1 appears twice" in str(error.value)
+    # The repeated shard's categories are not also reported as duplicates
+    assert "is in both" not in str(error.value)
+
+
+def test_merge_reports_a_category_in_two_shards(tmp_path):
+    paths = write_partials(tmp_path, 2)
+    partial = json.loads(paths[1].read_text(encoding="utf-8"))
+    stolen = next(iter(json.loads(paths[0].read_text(encoding="utf-8"))["categories"]))
+    partial["categories"][stolen] = []
+    paths[1].write_text(json.dumps(partial), encoding="utf-8")
+    with pytest.raises(ValueError, match=f"category '{stolen}' is in both"):
+        merge_partial_results(paths)
+
+
+def test_merge_reports_unscraped_and_mismatched_counts(tmp_path):
+    categories = {name: [] for name in SIDEBAR[1:]}
+    paths = write_partials(tmp_path, 2, categories=categories)
+    with pytest.raises(ValueError, match=f"1 categories were not scraped by any shard: {SIDEBAR[0]}"):
+        merge_partial_results(paths)
+    (tmp_path / "other").mkdir()
+    other = write_partials(tmp_path / "other", 3)
+    with pytest.raises(ValueError, match="disagree on the shard count"):
+        merge_partial_results(paths + other[2:])
+
+
+def test_merge_needs_at_least_one_output():
+    with pytest.raises(ValueError, match="no shard outputs"):
+        merge_partial_results([])